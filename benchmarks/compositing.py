@@ -0,0 +1,103 @@
+"""
+Compares the compositing of the layers with many rectangles: the paste of an overlay image per rectangle,
+the Pillow backend and the NumPy backend.
+
+    python -m benchmarks.compositing
+"""
+from __future__ import annotations
+from os.path import join
+from random import Random
+from timeit import timeit
+from PIL import Image
+from image_pattern.compositing import (
+    CompositingBackend,
+    configure,
+)
+from image_pattern.elements import Point
+from image_pattern.elements.rectangle import RectangleDrawer
+from image_pattern.layers import Layer
+from tests.settings import ASSETS_PATH
+
+COUNTS = [10, 100, 1000]
+CANVAS_SIZE = (1200, 630)
+NUMBER = 10
+BACKGROUND_IMAGE = join(ASSETS_PATH, 'Finn-the-human.jpg')
+
+
+def create_drawers(kind, count, seed=0):
+    random = Random(seed)
+    drawers = []
+
+    for index in range(count):
+        x, y = random.randrange(0, CANVAS_SIZE[0]), random.randrange(0, CANVAS_SIZE[1])
+        drawers.append(RectangleDrawer(
+            size=(random.randrange(10, 160), random.randrange(10, 80)),
+            point=Point(x=x, y=y),
+            start_point=Point(x=x, y=y),
+            **KINDS[kind](random, index),
+        ))
+
+    return drawers
+
+
+def _get_color(random):
+    return random.randrange(256), random.randrange(256), random.randrange(256)
+
+
+KINDS = {
+    'opaque': lambda random, index: dict(background_color=_get_color(random)),
+    'translucent': lambda random, index: dict(background_color=_get_color(random), alpha=128),
+    'tiles': lambda random, index: dict(background_image=BACKGROUND_IMAGE),
+    # Every fifth rectangle is a tile of an image, the half of the others are translucent.
+    'mixed': lambda random, index: dict(
+        background_image=BACKGROUND_IMAGE if index % 5 == 4 else None,
+        background_color=_get_color(random),
+        alpha=random.choice([None, 128]),
+    ),
+}
+
+
+def paste_overlays(image, drawers):
+    for drawer in drawers:
+        overlay_image = drawer.get_image()
+        image.paste(overlay_image, drawer.start_point.to_tuple(), mask=overlay_image)
+
+    return image
+
+
+def draw_layer(image, drawers):
+    return Layer().draw(image, drawers)
+
+
+def measure(draw, drawers, backend=CompositingBackend.PILLOW):
+    configure(backend)
+    canvas = Image.new('RGB', CANVAS_SIZE)
+    # Warm the cache of the tiles.
+    draw(canvas.copy(), drawers)
+
+    try:
+        return timeit(lambda: draw(canvas.copy(), drawers), number=NUMBER) / NUMBER * 1000
+    finally:
+        configure()
+
+
+def main():
+    print('{:>12} {:>8} {:>12} {:>12} {:>12}'.format('kind', 'count', 'paste', 'pillow', 'numpy'))
+
+    for kind in KINDS:
+        for count in COUNTS:
+            drawers = create_drawers(kind, count)
+            results = [
+                measure(paste_overlays, drawers),
+                measure(draw_layer, drawers),
+                measure(draw_layer, drawers, CompositingBackend.NUMPY),
+            ]
+            print('{:>12} {:>8} {:>12} {:>12} {:>12}'.format(
+                kind,
+                count,
+                *['{:.2f}ms'.format(result) for result in results]
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Compares the overlap resolution of the layers with the box index and the previous scan over all drawn areas.
+
+    python -m benchmarks.layers
+"""
+from __future__ import annotations
+from random import Random
+from timeit import timeit
+from image_pattern.elements import Point
+from image_pattern.elements.base import Drawer
+from image_pattern.layers import arrange_drawers
+
+COUNTS = [100, 1000, 2000, 10000]
+# The previous scan is quadratic, so it's measured only for the smaller layers.
+MAX_SCAN_COUNT = 2000
+CANVAS_SIZE = (1200, 630)
+
+
+def create_drawers(count, seed=0):
+    random = Random(seed)
+    drawers = []
+
+    for _ in range(count):
+        x, y = random.randrange(0, CANVAS_SIZE[0]), random.randrange(0, CANVAS_SIZE[1])
+        drawers.append(Drawer(
+            size=(random.randrange(10, 80), random.randrange(10, 40)),
+            point=Point(x=x, y=y),
+            start_point=Point(x=x, y=y),
+        ))
+
+    return drawers
+
+
+def scan_drawers(drawers):
+    drawers = sorted(drawers, key=lambda drawer: drawer.start_point.x + drawer.start_point.y)
+    filled_areas = []
+
+    for drawer in drawers:
+        x, y = drawer.start_point.x, drawer.start_point.y
+
+        for left, top, width, height in filled_areas:
+            if left + width > x >= left and top + height > y >= top:
+                height_offset = top + height - drawer.start_point.y
+                drawer.start_point.y += height_offset
+                drawer.point.y += height_offset
+
+        filled_areas.append((drawer.start_point.x, drawer.start_point.y, *drawer.size))
+
+    return drawers
+
+
+def measure(arrange, drawers):
+    return timeit(lambda: arrange(drawers), number=1) * 1000
+
+
+def main():
+    print('{:>8} {:>12} {:>12}'.format('count', 'scan', 'index'))
+
+    for count in COUNTS:
+        results = [
+            measure(arrange, create_drawers(count))
+            if arrange is arrange_drawers or count <= MAX_SCAN_COUNT else None
+            for arrange in [scan_drawers, arrange_drawers]
+        ]
+        print('{:>8} {:>12} {:>12}'.format(
+            count,
+            *['{:.1f}ms'.format(result) if result is not None else '-' for result in results]
+        ))
+
+
+if __name__ == '__main__':
+    main()
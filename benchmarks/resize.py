@@ -0,0 +1,56 @@
+"""
+Compares the single-pass resize_image() with the previous two-pass scaling and cropping.
+
+    python -m benchmarks.resize
+"""
+from __future__ import annotations
+from timeit import repeat
+from PIL import Image
+from image_pattern.size import (
+    resize_image,
+    scale_image,
+    crop_image,
+)
+
+SOURCE_SIZES = [
+    (1024, 768),
+    (4000, 3000),
+    (6000, 4000),
+]
+SIZES = [
+    (458, 630),
+    (1200, 630),
+    (200, 200),
+]
+NUMBER = 5
+
+
+def two_pass_resize(image, size):
+    image, center = scale_image(image, size)
+    return crop_image(image, size, center)
+
+
+def main():
+    print('{:>12} {:>12} {:>12} {:>12} {:>12}'.format('source', 'size', 'two-pass', 'single', 'gap=2.0'))
+
+    for source_size in SOURCE_SIZES:
+        image = Image.new('RGBA', source_size, (3, 202, 252, 255))
+
+        for size in SIZES:
+            results = [
+                min(repeat(lambda: resize(image, size), number=NUMBER, repeat=3)) / NUMBER * 1000
+                for resize in [
+                    two_pass_resize,
+                    resize_image,
+                    lambda image, size: resize_image(image, size, reducing_gap=2.0),
+                ]
+            ]
+            print('{:>12} {:>12} {:>10.2f}ms {:>10.2f}ms {:>10.2f}ms'.format(
+                '{}x{}'.format(*source_size),
+                '{}x{}'.format(*size),
+                *results
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+"""
+Benchmarks of the render stages for the test patterns and synthetic stress patterns.
+Every case reports the median time of the stages, the throughput of full renders and the peak memory.
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --save
+    python -m benchmarks.suite --compare
+    python -m benchmarks.suite --case complex --case many-elements --repeat 20
+
+The stages are:
+
+* bind - binding the fields of all elements to the context;
+* layout - Pattern.layout(), creating the drawers, wrapping texts and resolving overlaps;
+* decode - opening and resizing the background images, with the tile cache cold;
+* composite - drawing the layout on the canvas, with the caches warm;
+* encode - encoding the image to JPEG.
+"""
+from __future__ import annotations
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+from argparse import ArgumentParser
+from io import BytesIO
+from json import (
+    dump,
+    load,
+)
+from os.path import (
+    dirname,
+    exists,
+    join,
+)
+from resource import (
+    RUSAGE_SELF,
+    getrusage,
+)
+from statistics import median
+from sys import (
+    exit,
+    platform,
+)
+from time import perf_counter
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop,
+)
+from PIL import Image
+from image_pattern import (
+    Canvas,
+    Context,
+    Layer,
+    Layout,
+    Pattern,
+    Point,
+    Rectangle,
+    Text,
+    HorizontalAlignment,
+    VerticalAlignment,
+)
+from image_pattern.elements.rectangle import RectangleDrawer
+from image_pattern.images import tiles
+from image_pattern.patterns import get_image_blob
+from tests.patterns import (
+    ComplexContext,
+    ComplexPattern,
+    OffsetPattern,
+    SimpleTestPattern,
+    SmallTestPattern,
+    SmallTestPatternContext,
+)
+from tests.settings import ASSETS_PATH
+
+DEFAULT_BASELINE_PATH = join(dirname(__file__), 'baseline.json')
+DEFAULT_REPEAT = 10
+# Ratio of the time to the baseline, above which the stage is reported as a regression.
+DEFAULT_THRESHOLD = 1.2
+STAGES = ['bind', 'layout', 'decode', 'composite', 'encode', 'total']
+FONT_PATH = join(ASSETS_PATH, 'IBMPlexSans-Regular.ttf')
+GRID_SIZE = 30
+LONG_TEXT = ' '.join(['Finn the Human and Jake the Dog go on an adventure in the Land of Ooo.'] * 20)
+HUGE_BACKGROUND_SIZE = (6000, 4000)
+
+
+class StressContext(Context):
+    color: tuple
+    text: str
+    background: Optional[BytesIO]
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ManyElementsPattern(Pattern):
+    canvas: Canvas = Canvas(
+        size=(1200, 630),
+    )
+    layers: List[Layer] = [
+        Layer(
+            *[
+                Rectangle(
+                    background_color=StressContext.var('color'),
+                    size=(30, 15),
+                    point=Point(
+                        x=x * 40,
+                        y=y * 21,
+                    ),
+                )
+                for x in range(GRID_SIZE)
+                for y in range(GRID_SIZE)
+            ],
+        ),
+        Layer(
+            *[
+                Text(
+                    text=StressContext.var('text'),
+                    font=FONT_PATH,
+                    font_size=14,
+                    point=Point(
+                        x=x * 120,
+                        y=y * 63,
+                    ),
+                )
+                for x in range(10)
+                for y in range(10)
+            ],
+        ),
+    ]
+
+
+class LongTextPattern(Pattern):
+    canvas: Canvas = Canvas(
+        size=(1200, 630),
+    )
+    layers: List[Layer] = [
+        Layer(
+            Text(
+                text=StressContext.var('text'),
+                font=FONT_PATH,
+                font_size=24,
+                point=Point(
+                    x=40,
+                    y=40,
+                ),
+            ),
+        ),
+    ]
+
+
+class HugeBackgroundPattern(Pattern):
+    canvas: Canvas = Canvas(
+        size=(1200, 630),
+    )
+    layers: List[Layer] = [
+        Layer(
+            Rectangle(
+                background_image=StressContext.var('background'),
+                size=(1200, 630),
+                point=Point(
+                    x=600,
+                    y=315,
+                ),
+                horizontal_alignment=HorizontalAlignment.CENTER,
+                vertical_alignment=VerticalAlignment.CENTER,
+                brightness=0.8,
+            ),
+        ),
+    ]
+
+
+def create_stress_context(text: str = 'JAKE', background: Optional[BytesIO] = None) -> StressContext:
+    return StressContext(
+        color=(3, 202, 252),
+        text=text,
+        background=background,
+    )
+
+
+def create_huge_background() -> BytesIO:
+    image = Image.linear_gradient('L').resize(HUGE_BACKGROUND_SIZE).convert('RGB')
+    blob = BytesIO()
+    image.save(blob, format='JPEG', quality=90)
+    return blob
+
+
+CASES: Dict[str, Callable[[], Pattern]] = {
+    'simple': SimpleTestPattern,
+    'small': lambda: SmallTestPattern(
+        context=SmallTestPatternContext(
+            text='JAKE',
+            background_color=(3, 202, 252),
+            horizontal_alignment=HorizontalAlignment.CENTER,
+            vertical_alignment=VerticalAlignment.CENTER,
+        ),
+    ),
+    'complex': lambda: ComplexPattern(
+        context=ComplexContext(
+            left_image=join(ASSETS_PATH, 'Finn-the-human.jpg'),
+            right_image=join(ASSETS_PATH, 'Jake-the-dog.jpg'),
+            title='FINN THE HUMAN',
+            text='Adventure time',
+            layer_exists=True,
+        ),
+    ),
+    'offset': OffsetPattern,
+    'many-elements': lambda: ManyElementsPattern(context=create_stress_context()),
+    'long-text': lambda: LongTextPattern(context=create_stress_context(text=LONG_TEXT)),
+    'huge-background': lambda: HugeBackgroundPattern(
+        context=create_stress_context(background=create_huge_background()),
+    ),
+}
+
+
+def measure(function: Callable, repeat: int) -> float:
+    """
+    Median time of the function in milliseconds.
+    """
+    times = []
+
+    for _ in range(repeat):
+        started = perf_counter()
+        function()
+        times.append((perf_counter() - started) * 1000)
+
+    return median(times)
+
+
+def decode(layout: Layout):
+    for layer_layout in layout.layers:
+        for drawer in layer_layout.get_drawers():
+            if isinstance(drawer, RectangleDrawer) and drawer.background_image:
+                tiles.clear()
+                drawer.get_image()
+
+
+def get_peak_memory(pattern: Pattern) -> float:
+    """
+    Peak size of the Python objects in megabytes during a cold render.
+    The pixel buffers of Pillow aren't allocated by Python, they are seen only in the max resident set size.
+    """
+    tiles.clear()
+    start()
+
+    try:
+        pattern.render_to_blob()
+        _, peak = get_traced_memory()
+    finally:
+        stop()
+
+    return peak / 1024 / 1024
+
+
+def get_max_rss() -> float:
+    max_rss = getrusage(RUSAGE_SELF).ru_maxrss
+    # The size is in bytes on macOS and in kilobytes on Linux.
+    return max_rss / 1024 / 1024 if platform == 'darwin' else max_rss / 1024
+
+
+def run_case(name: str, repeat: int) -> Dict[str, float]:
+    pattern = CASES[name]()
+    elements = [element for layer in pattern.layers for element in layer.elements]
+    # Warm the caches, which are shared by the renders of the process.
+    image = pattern.render()
+    layout = pattern.layout()
+
+    result = {
+        'bind': measure(lambda: [element.collect_data(pattern.context) for element in elements], repeat),
+        'layout': measure(pattern.layout, repeat),
+        'decode': measure(lambda: decode(layout), repeat),
+        'composite': measure(lambda: pattern.render(layout=layout), repeat),
+        'encode': measure(lambda: get_image_blob(image), repeat),
+        'total': measure(pattern.render_to_blob, repeat),
+    }
+    result['throughput'] = 1000 / result['total']
+    result['peak_memory'] = get_peak_memory(pattern)
+    result['max_rss'] = get_max_rss()
+
+    return result
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    regressions = []
+
+    for name, result in results.items():
+        for stage in STAGES:
+            expected = baseline.get(name, {}).get(stage)
+
+            # Stages faster than 0.1 ms are too noisy to compare.
+            if expected and max(result[stage], expected) > 0.1 and result[stage] > expected * threshold:
+                regressions.append('{} {}: {:.2f}ms, baseline {:.2f}ms'.format(name, stage, result[stage], expected))
+
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description='Benchmarks of the render stages.')
+    parser.add_argument('--case', action='append', choices=list(CASES), help='case to run, all by default')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='path of the baseline file')
+    parser.add_argument('--save', action='store_true', help='save the results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='compare the results with the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    arguments = parser.parse_args()
+
+    results = {}
+    print('{:>16}'.format('case') + ''.join('{:>11}'.format(stage) for stage in STAGES) + ' {:>10} {:>9} {:>9}'.format(
+        'renders/s', 'peak', 'max rss',
+    ))
+
+    for name in arguments.case or CASES:
+        result = results[name] = run_case(name, arguments.repeat)
+        print('{:>16}'.format(name) + ''.join('{:>9.2f}ms'.format(result[stage]) for stage in STAGES) +
+              ' {:>10.1f} {:>7.1f}MB {:>7.1f}MB'.format(result['throughput'], result['peak_memory'], result['max_rss']))
+
+    if arguments.save:
+        with open(arguments.baseline, 'w') as file:
+            dump(results, file, indent=4, sort_keys=True)
+
+    if arguments.compare:
+        if not exists(arguments.baseline):
+            exit('Baseline {} doesn\'t exist, run with --save first.'.format(arguments.baseline))
+
+        with open(arguments.baseline) as file:
+            regressions = compare(results, load(file), arguments.threshold)
+
+        for regression in regressions:
+            print('Regression: {}'.format(regression))
+
+        if regressions:
+            exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:15
+
+import example_app.image_patterns
+import image_pattern.contrib.django
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('example_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examplemodel',
+            name='deferred_image',
+            field=image_pattern.contrib.django.ImagePatternField(blank=True, context=None, deferred=True, null=True, pattern=example_app.image_patterns.ImagePattern, save_params={}, should_be_created=None, upload_to='', verbose_name='Фотография'),
+        ),
+    ]
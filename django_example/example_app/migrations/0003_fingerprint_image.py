@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:19
+
+import example_app.image_patterns
+import image_pattern.contrib.django
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('example_app', '0002_deferred_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examplemodel',
+            name='fingerprint_image',
+            field=image_pattern.contrib.django.ImagePatternField(blank=True, context=None, deferred=False, file_naming='FINGERPRINT', format='JPEG', null=True, pattern=example_app.image_patterns.ImagePattern, save_params={}, should_be_created=None, upload_to='', verbose_name='Фотография'),
+        ),
+    ]
@@ -2,7 +2,10 @@ from django.db.models import (
     Model,
     CharField,
 )
-from image_pattern.contrib.django import ImagePatternField
+from image_pattern.contrib.django import (
+    ImagePatternField,
+    FileNaming,
+)
 
 from .image_patterns import (
     ImagePattern,
@@ -48,6 +51,27 @@ class ExampleModel(Model):
         blank=True,
         null=True,
     )
+    deferred_image = ImagePatternField(
+        ImagePattern,
+        verbose_name='Фотография',
+        blank=True,
+        null=True,
+        deferred=True,
+    )
+    fingerprint_image = ImagePatternField(
+        ImagePattern,
+        verbose_name='Фотография',
+        blank=True,
+        null=True,
+        file_naming=FileNaming.FINGERPRINT,
+    )
+    content_image = ImagePatternField(
+        ImagePattern,
+        verbose_name='Фотография',
+        blank=True,
+        null=True,
+        file_naming=FileNaming.CONTENT,
+    )
     status = CharField(
         max_length=20,
         choices=Statuses.CHOICES,
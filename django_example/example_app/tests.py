@@ -1,16 +1,41 @@
-from os import remove
-from django.test import TestCase
+from os import (
+    remove,
+    removedirs,
+)
+from unittest.mock import patch
+from django.core.files.storage import default_storage
+from django.test import (
+    TestCase,
+    override_settings,
+)
 from image_pattern import __version__
+from image_pattern.contrib.django import (
+    ImagePatternField,
+    RenderState,
+)
 
+from .image_patterns import ImagePattern
 from .models import (
     ExampleModel,
     Statuses,
 )
 
+renders = []
+
+
+class CountingImagePattern(ImagePattern):
+    def render_to_blob(self, *args, **kwargs):
+        renders.append(self.context)
+        return super().render_to_blob(*args, **kwargs)
+
 
 class ImagePatternTestCase(TestCase):
     text = 'What time is it?'
 
+    def setUp(self) -> None:
+        self.file_names = set()
+        renders.clear()
+
     def test_version(self):
         self.assertEqual(__version__, '0.0.18')
 
@@ -29,7 +54,114 @@ class ImagePatternTestCase(TestCase):
         self.assertIsNotNone(instance.image.name)
         self.assertIsNotNone(instance.image_with_custom_methods.name)
 
+    @override_settings(IMAGE_PATTERN_DEFERRED_SYNC=True)
+    def test_deferred_image_create(self):
+        instance: ExampleModel = ExampleModel(text=self.text, status=Statuses.PUBLISH)
+        field = ExampleModel._meta.get_field('deferred_image')
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            instance.save()
+
+        loaded_instance = ExampleModel.objects.get(pk=instance.pk)
+
+        self.assertIsNone(instance.deferred_image.name)
+        self.assertEqual(field.get_render_state(instance), RenderState.EMPTY)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNotNone(instance.deferred_image.name)
+        self.assertEqual(field.get_render_state(instance), RenderState.READY)
+        self.assertFalse(loaded_instance.deferred_image)
+        self.assertEqual(field.get_render_state(loaded_instance), RenderState.READY)
+        self.assertEqual(
+            ExampleModel.objects.get(pk=instance.pk).deferred_image.name,
+            instance.deferred_image.name,
+        )
+
+    def test_fingerprint_file_name(self):
+        instance: ExampleModel = ExampleModel(text=self.text, status=Statuses.PUBLISH)
+        same_instance: ExampleModel = ExampleModel(text=self.text, status=Statuses.PUBLISH)
+        field = ExampleModel._meta.get_field('fingerprint_image')
+
+        with patch.object(field, 'pattern', CountingImagePattern):
+            self._save(instance)
+            file_name = instance.fingerprint_image.name
+            self._save(instance)
+            self._save(same_instance)
+
+            self.assertEqual(len(renders), 1)
+            self.assertEqual(instance.fingerprint_image.name, file_name)
+            self.assertEqual(same_instance.fingerprint_image.name, file_name)
+
+            instance.text = 'What is it?'
+            self._save(instance)
+
+            self.assertEqual(len(renders), 2)
+            self.assertNotEqual(instance.fingerprint_image.name, file_name)
+
+    def test_fingerprint_dated_upload_to(self):
+        instance: ExampleModel = ExampleModel(text=self.text, status=Statuses.PUBLISH)
+        field = ExampleModel._meta.get_field('fingerprint_image')
+        directories = iter(['2020/01/01', '2020/01/02'])
+
+        def upload_to(instance, file_name):
+            return '{}/{}'.format(next(directories), file_name)
+
+        self.addCleanup(removedirs, default_storage.path('2020/01/01'))
+
+        with patch.object(field, 'pattern', CountingImagePattern), patch.object(field, 'upload_to', upload_to):
+            self._save(instance)
+            file_name = instance.fingerprint_image.name
+            self._save(instance)
+
+        self.assertEqual(len(renders), 1)
+        self.assertEqual(instance.fingerprint_image.name, file_name)
+
+    def test_content_file_name(self):
+        instance: ExampleModel = ExampleModel(text=self.text, status=Statuses.PUBLISH)
+        same_instance: ExampleModel = ExampleModel(text=self.text, status=Statuses.PUBLISH)
+        field = ExampleModel._meta.get_field('content_image')
+
+        with patch.object(field, 'pattern', CountingImagePattern):
+            self._save(instance)
+            file_name = instance.content_image.name
+            self._save(instance)
+            self._save(same_instance)
+
+            self.assertEqual(len(renders), 3)
+            self.assertEqual(instance.content_image.name, file_name)
+            self.assertEqual(same_instance.content_image.name, file_name)
+
+            instance.text = 'What is it?'
+            self._save(instance)
+
+            self.assertNotEqual(instance.content_image.name, file_name)
+
+    def _save(self, instance: ExampleModel):
+        instance.save()
+
+        for field_name in ['image', 'image_with_custom_methods', 'fingerprint_image', 'content_image']:
+            self.file_names.add(getattr(instance, field_name).name)
+
+    def test_file_name_extension(self):
+        self.assertTrue(ImagePatternField(ImagePattern).get_file_name().endswith('.jpeg'))
+        self.assertTrue(ImagePatternField(ImagePattern, format='png').get_file_name().endswith('.png'))
+        self.assertTrue(ImagePatternField(ImagePattern, format='WEBP').get_file_name().endswith('.webp'))
+
     def tearDown(self) -> None:
         for instance in ExampleModel.objects.all():
             instance.image.storage.delete(instance.image.name)
             instance.image_with_custom_methods.storage.delete(instance.image_with_custom_methods.name)
+
+            if instance.deferred_image.name:
+                instance.deferred_image.storage.delete(instance.deferred_image.name)
+
+            if instance.fingerprint_image.name:
+                instance.fingerprint_image.storage.delete(instance.fingerprint_image.name)
+
+            if instance.content_image.name:
+                instance.content_image.storage.delete(instance.content_image.name)
+
+        for file_name in self.file_names:
+            default_storage.delete(file_name)
@@ -10,5 +10,7 @@ from .elements import (
     HorizontalAlignment,
     VerticalAlignment,
 )
+from .encoders import ImageFormat
 from .layers import Layer
+from .layout import Layout
 from .patterns import Pattern
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    TypeVar,
+)
+from asyncio import (
+    AbstractEventLoop,
+    Semaphore,
+    get_running_loop,
+)
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import cpu_count
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+T = TypeVar('T')
+
+# Pillow releases the GIL while decoding, resampling and encoding,
+# so the renders of a loop run in threads, up to the count of CPUs at once by default.
+DEFAULT_MAX_WORKERS = cpu_count() or 1
+DEFAULT_CONCURRENCY = DEFAULT_MAX_WORKERS
+
+_settings = {
+    'max_workers': DEFAULT_MAX_WORKERS,
+    'concurrency': DEFAULT_CONCURRENCY,
+}
+_executor: Optional[ThreadPoolExecutor] = None
+_semaphores: WeakKeyDictionary = WeakKeyDictionary()
+_lock = Lock()
+
+
+def configure(max_workers: Optional[int] = None, concurrency: Optional[int] = None):
+    """
+    Set the size of the thread pool shared by all loops and the count of the renders running at once in a loop.
+    The renders above the limit wait for a free slot, so a loop doesn't submit more work than the pool can do.
+    """
+    global _executor
+
+    with _lock:
+        _settings['max_workers'] = max_workers or _settings['max_workers']
+        _settings['concurrency'] = concurrency or _settings['concurrency']
+        executor, _executor = _executor, None
+        _semaphores.clear()
+
+    if executor:
+        executor.shutdown(wait=False)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_settings['max_workers'],
+                thread_name_prefix='image-pattern',
+            )
+
+        return _executor
+
+
+async def run_in_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = get_running_loop()
+
+    async with _get_semaphore(loop):
+        return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+def _get_semaphore(loop: AbstractEventLoop) -> Semaphore:
+    with _lock:
+        semaphore = _semaphores.get(loop)
+
+        if semaphore is None:
+            semaphore = _semaphores[loop] = Semaphore(_settings['concurrency'])
+
+        return semaphore
@@ -0,0 +1,157 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    cast,
+)
+from collections import OrderedDict
+from threading import RLock
+from weakref import WeakValueDictionary
+
+V = TypeVar('V')
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    length: int
+    size: int
+    maxsize: int
+
+
+class LRUCache(Generic[V]):
+    """
+    Thread-safe LRU cache shared by the renders of the process.
+    The size of the cache is the sum of the weights of the values,
+    by default every value weighs 1, so maxsize is the number of values.
+    The named caches are registered for get_cache_stats().
+    """
+
+    def __init__(self, maxsize: int, get_weight: Optional[Callable[[V], int]] = None, name: Optional[str] = None):
+        self.name = name
+        self._maxsize = maxsize
+        self._get_weight = get_weight or (lambda value: 1)
+        self._values: OrderedDict[Hashable, V] = OrderedDict()
+        self._weights: dict = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = RLock()
+
+        if name:
+            caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._values[key]
+            except KeyError:
+                self._misses += 1
+                return default
+
+            self._values.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> V:
+        weight = self._get_weight(value)
+
+        with self._lock:
+            if key in self._values:
+                self._discard(key)
+
+            if weight <= self._maxsize:
+                self._values[key] = value
+                self._weights[key] = weight
+                self._size += weight
+                self._evict()
+
+        return value
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """
+        Return the cached value or create it with the factory.
+        The factory is called without holding the lock, so the concurrent misses
+        of the same key may create the value twice, but only the first one is kept.
+        """
+        with self._lock:
+            value = self.get(key, _missing)
+
+        if value is _missing:
+            value = factory()
+
+            with self._lock:
+                cached = self._values.get(key, _missing)
+                value = self.set(key, value) if cached is _missing else cached
+
+        return cast(V, value)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self._weights.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                length=len(self._values),
+                size=self._size,
+                maxsize=self._maxsize,
+            )
+
+    def _evict(self):
+        while self._size > self._maxsize and self._values:
+            key = next(iter(self._values))
+            self._discard(key)
+
+    def _discard(self, key: Hashable):
+        del self._values[key]
+        self._size -= self._weights.pop(key)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Statistics of the named caches with the ratio of hits to all lookups.
+    """
+    stats = {}
+
+    for name, cache in list(caches.items()):
+        info = cache.info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            **info._asdict(),
+            'hit_ratio': info.hits / lookups if lookups else 0.0,
+        }
+
+    return stats
+
+
+caches: WeakValueDictionary[str, LRUCache] = WeakValueDictionary()
+_missing = object()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+    cast,
+)
+from enum import Enum
+from importlib import import_module
+from types import ModuleType
+from weakref import finalize
+from typing_extensions import TypedDict
+from PIL import Image
+
+from .elements.base import Drawer
+from .elements.rectangle import (
+    FILLED_MODES,
+    RectangleDrawer,
+)
+from .hooks import timed
+from .memory import (
+    release,
+    reserve_image,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from numpy import ndarray
+    from PIL.Image import Image as PillowImage
+
+# Count of the consecutive image tiles of a layer, from which they are composited on an array.
+# The shorter runs don't pay off the copies of the canvas to the array and back.
+MIN_BATCH_SIZE = 50
+
+# Mode of the arrays of the canvases.
+ARRAY_MODE = 'RGBX'
+
+
+class CompositingBackend(str, Enum):
+    PILLOW = 'PILLOW'
+    NUMPY = 'NUMPY'
+
+
+class _Settings(TypedDict):
+    backend: CompositingBackend
+    min_batch_size: int
+
+
+def _import_numpy() -> Optional[ModuleType]:
+    try:
+        return import_module('numpy')
+    except ImportError:  # pragma: no cover
+        return None
+
+
+numpy = _import_numpy()
+# Arrays of the tiles by the ids of the tiles, which are removed with the tiles.
+_tile_pixels: Dict[int, Tuple[ndarray, Optional[ndarray]]] = {}
+_settings: _Settings = {
+    'backend': CompositingBackend.PILLOW,
+    'min_batch_size': MIN_BATCH_SIZE,
+}
+
+
+def configure(
+        backend: Union[CompositingBackend, str] = CompositingBackend.PILLOW,
+        min_batch_size: int = MIN_BATCH_SIZE,
+):
+    """
+    Set the backend, which draws the elements of the layers.
+    With CompositingBackend.NUMPY the runs of at least min_batch_size rectangles with background images
+    are drawn on a NumPy array of the canvas, which is copied once per run, instead of a paste per tile.
+    The solid rectangles are filled by Pillow with either backend.
+    """
+    backend = CompositingBackend(backend)
+
+    if backend == CompositingBackend.NUMPY:
+        _get_numpy()
+
+    _settings['backend'] = backend
+    _settings['min_batch_size'] = min_batch_size
+
+
+def get_backend() -> CompositingBackend:
+    return _settings['backend']
+
+
+def composite(image: PillowImage, drawers: Sequence[Drawer]) -> PillowImage:
+    """
+    Draw the drawers on the image in their order with the configured backend.
+    """
+    if _settings['backend'] != CompositingBackend.NUMPY or image.mode not in FILLED_MODES:
+        for drawer in drawers:
+            image = _draw_element(image, drawer)
+
+        return image
+
+    batch: List[Drawer] = []
+
+    for drawer in drawers:
+        if _is_batched(drawer):
+            batch.append(drawer)
+        else:
+            image = _draw_batch(image, batch)
+            image = _draw_element(image, drawer)
+            batch = []
+
+    return _draw_batch(image, batch)
+
+
+def _draw_element(image: PillowImage, drawer: Drawer) -> PillowImage:
+    with timed('element', element=type(drawer).__name__):
+        return drawer.draw(image)
+
+
+def _is_batched(drawer: Drawer) -> bool:
+    return isinstance(drawer, RectangleDrawer) and bool(drawer.background_image)
+
+
+def _draw_batch(image: PillowImage, drawers: List[Drawer]) -> PillowImage:
+    """
+    Draw the batched drawers, which are the rectangles with background images, on an array of the image.
+    """
+    if len(drawers) < _settings['min_batch_size']:
+        for drawer in drawers:
+            image = _draw_element(image, drawer)
+
+        return image
+
+    numpy = _get_numpy()
+
+    with timed('element', element=RectangleDrawer.__name__, count=len(drawers)):
+        # The pixels are padded to 4 bytes, so the opaque regions are filled and copied as 32-bit words.
+        buffer = reserve_image(image.size, ARRAY_MODE)
+        width, height = image.size
+        array = numpy.empty((height, width, 4), dtype=numpy.uint8)
+        # The image mapped onto the array receives the pixels of the canvas without the intermediate bytes.
+        Image.frombuffer(ARRAY_MODE, image.size, array, 'raw', ARRAY_MODE, 0, 1).im.paste(
+            image.im,
+            (0, 0, width, height),
+        )
+        words = array.view(numpy.uint32)[..., 0]
+
+        for drawer in drawers:
+            _draw_rectangle(array, words, cast(RectangleDrawer, drawer))
+
+        image.frombytes(array, 'raw', ARRAY_MODE)
+        release(buffer)
+
+    return image
+
+
+def _draw_rectangle(array: ndarray, words: ndarray, drawer: RectangleDrawer):
+    """
+    Draw the rectangle on the array of the canvas, the same as RectangleDrawer.draw() on the image.
+    :param words: view of the array with the pixels as 32-bit words.
+    """
+    x, y = drawer.start_point.to_tuple()
+    width, height = drawer.size
+    canvas_height, canvas_width = array.shape[:2]
+    left, top = max(x, 0), max(y, 0)
+    right, bottom = min(x + width, canvas_width), min(y + height, canvas_height)
+
+    if right <= left or bottom <= top:
+        return
+
+    pixels, tile_words = _get_tile_pixels(drawer.get_image())
+
+    if tile_words is not None:
+        words[top:bottom, left:right] = tile_words[top - y:bottom - y, left - x:right - x]
+    else:
+        pixels = pixels[top - y:bottom - y, left - x:right - x]
+        _blend(array[top:bottom, left:right], pixels, pixels[..., 3:])
+
+
+def _get_tile_pixels(tile: PillowImage) -> Tuple[ndarray, Optional[ndarray]]:
+    """
+    Array of the pixels of the tile and its view with the pixels as 32-bit words, if the tile is opaque.
+    The tiles are shared by the renders and not modified, so their arrays are cached while they exist.
+    """
+    pixels = _tile_pixels.get(id(tile))
+
+    if pixels is None:
+        numpy = _get_numpy()
+        array = numpy.asarray(tile)
+        tile_words = array.view(numpy.uint32)[..., 0] if array[..., 3].min() == 255 else None
+        pixels = _tile_pixels[id(tile)] = (array, tile_words)
+        finalize(tile, _tile_pixels.pop, id(tile), None)
+
+    return pixels
+
+
+def _blend(region: ndarray, colors: ndarray, alpha: ndarray):
+    """
+    Blend the colors into the region with the same rounding as the paste of Pillow with a mask.
+    The blended values are less than 255 * 255 + 128, so they fit into 16 bits.
+    :param alpha: alpha of every pixel.
+    """
+    numpy = _get_numpy()
+    alpha = alpha.astype(numpy.uint16)
+    blended = region.astype(numpy.uint16) * (255 - alpha) + colors * alpha + 128
+    region[...] = ((blended >> 8) + blended) >> 8
+
+
+def _get_numpy() -> ModuleType:
+    if numpy is None:
+        raise ImportError('NumPy backend requires numpy, install it with the extra: pip install image-pattern[numpy]')
+
+    return numpy
@@ -1,6 +1,24 @@
 from __future__ import annotations
-from typing import Union, Any, TypeVar
-from pydantic import BaseModel
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+from io import BytesIO
+from types import MappingProxyType
+from pydantic import (
+    BaseModel,
+    PrivateAttr,
+)
+
+from .images import source_key
 
 
 T = TypeVar('T')
@@ -18,3 +36,103 @@ class Context(BaseModel):
     def var(cls, key):
         return ContextVar(key=key)
 
+
+class Binding:
+    """
+    Plan of binding the fields of the model to the context, which is compiled once:
+    the values of the fields, which don't depend on the context, and the getters of the context variables.
+    """
+    __slots__ = ('static_values', 'dynamic_fields')
+
+    def __init__(self, model: BaseModel):
+        values = dict(model._iter())
+        self.static_values: Mapping[str, Any] = MappingProxyType({
+            field: value for field, value in values.items() if not isinstance(value, ContextVar)
+        })
+        self.dynamic_fields: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (field, value.get_from_context) for field, value in values.items() if isinstance(value, ContextVar)
+        )
+
+    def bind(self, context: Any) -> Mapping[str, Any]:
+        if not self.dynamic_fields:
+            return self.static_values
+
+        data: Dict[str, Any] = dict(self.static_values)
+
+        for field, get_value in self.dynamic_fields:
+            data[field] = get_value(context)
+
+        return data
+
+    def is_static(self) -> bool:
+        return not self.dynamic_fields
+
+
+class Bindable(BaseModel):
+    """
+    Model, which fields can be context variables.
+    The binding plan is compiled on the first use and dropped, when a field is changed.
+    """
+    _binding: Optional[Binding] = PrivateAttr(default=None)
+
+    def collect_data(self, context: Any) -> Mapping[str, Any]:
+        """
+        Values of the fields with the context variables taken from the context.
+        The result may be shared between calls, so it must not be modified.
+        """
+        return self.get_binding().bind(context)
+
+    def is_static(self) -> bool:
+        return self.get_binding().is_static()
+
+    def get_binding(self) -> Binding:
+        if self._binding is None:
+            self._binding = Binding(self)
+
+        return self._binding
+
+    def copy(self, **kwargs):
+        model = super().copy(**kwargs)
+        model._binding = None
+        return model
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+
+        if name in self.__fields__:
+            self._binding = None
+
+    def __getstate__(self):
+        # The plan isn't pickled, it's compiled again after unpickling.
+        state = super().__getstate__()
+        state['__private_attribute_values__'] = {
+            **state.get('__private_attribute_values__', {}),
+            '_binding': None,
+        }
+        return state
+
+
+def make_key(value: Any) -> Optional[Hashable]:
+    """
+    Hashable key of the context, equal for the contexts with equal values.
+    In-memory images are represented by the hash of their content.
+    Returns None if the context contains values that can't be represented.
+    """
+    try:
+        return _freeze(value)
+    except TypeError:
+        return None
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, BaseModel):
+        return type(value), _freeze(dict(value._iter()))
+    elif isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    elif isinstance(value, BytesIO):
+        return source_key(value)
+
+    hash(value)
+    return cast(Hashable, value)
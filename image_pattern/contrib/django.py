@@ -1,6 +1,106 @@
+from typing import (
+    Dict,
+    Hashable,
+    Optional,
+    cast,
+)
+from enum import Enum
+from hashlib import sha256
+from os.path import basename
 from uuid import uuid4
 from functools import partial
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+from threading import Lock
+from django.conf import settings
+from django.db import (
+    close_old_connections,
+    transaction,
+)
 from django.db.models import ImageField
+from django.db.models.signals import post_save
+
+from ..encoders import (
+    ImageFormat,
+    get_encoder,
+)
+from ..render_cache import get_render_key
+
+# Count of the threads rendering the deferred images, can be changed by IMAGE_PATTERN_DEFERRED_WORKERS setting.
+DEFAULT_DEFERRED_WORKERS = 2
+
+
+class RenderState(str, Enum):
+    EMPTY = 'EMPTY'
+    PENDING = 'PENDING'
+    READY = 'READY'
+
+
+class FileNaming(str, Enum):
+    """
+    UUID - a new random name for every render.
+    FINGERPRINT - hash of the pattern, context and encoder settings. The image isn't rendered again,
+    if the fingerprint is not changed, and the images of identical contexts share the file in the storage.
+    CONTENT - hash of the encoded image, so identical images share the file in the storage.
+    """
+    UUID = 'UUID'
+    FINGERPRINT = 'FINGERPRINT'
+    CONTENT = 'CONTENT'
+
+
+class DeferredRenderer:
+    """
+    Local pool of threads, which render the images of the deferred fields after the transaction commit.
+    With IMAGE_PATTERN_DEFERRED_SYNC setting the images are rendered right in the commit callback,
+    that is useful for tests.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    def submit(self, key, function, *args) -> Future:
+        if getattr(settings, 'IMAGE_PATTERN_DEFERRED_SYNC', False):
+            future: Future = Future()
+            future.set_result(function(*args))
+            return future
+
+        with self._lock:
+            future = self._get_executor().submit(self._run, function, *args)
+            self._pending[key] = future
+
+        future.add_done_callback(partial(self._discard, key))
+        return future
+
+    def get_future(self, key):
+        return self._pending.get(key)
+
+    @staticmethod
+    def _run(function, *args):
+        try:
+            return function(*args)
+        finally:
+            close_old_connections()
+
+    def _discard(self, key, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_PATTERN_DEFERRED_WORKERS', DEFAULT_DEFERRED_WORKERS),
+                thread_name_prefix='image-pattern-field',
+            )
+
+        return self._executor
+
+
+deferred_renderer = DeferredRenderer()
 
 
 class ImagePatternField(ImageField):
@@ -13,12 +113,24 @@ class ImagePatternField(ImageField):
             should_be_created=None,
             context=None,
             save_params=None,
+            deferred=False,
+            format=ImageFormat.JPEG,
+            file_naming=FileNaming.UUID,
             **kwargs
     ):
+        """
+        :param format: format of the image, one of ImageFormat, the file extension matches it.
+        :param file_naming: how the files are named, one of FileNaming.
+        :param deferred: render the image after the commit of the transaction in a local pool of threads
+        and update only the column of the field, instead of rendering it inside Model.save().
+        """
         self.pattern = pattern
         self.should_be_created_callback = should_be_created
         self.context = context
         self.save_params = save_params or {}
+        self.deferred = deferred
+        self.format = get_encoder(format).format
+        self.file_naming = FileNaming(file_naming)
         kwargs['blank'] = True
         super().__init__(**kwargs)
 
@@ -26,15 +138,140 @@ class ImagePatternField(ImageField):
         file = getattr(instance, self.attname)
 
         if self.should_be_created(instance):
-            file_name = self.get_file_name()
             context = self.get_context(instance)
-            image = self.pattern(context=context).render_to_blob(**self.save_params)
-            file.save(file_name, image, save=False)
+
+            if self.deferred:
+                # The render is scheduled in post_save, when the new instance already has the primary key.
+                instance.__dict__[self._get_deferred_context_attname()] = context
+            else:
+                file_name = self.render_image(instance, context)
+
+                if file_name:
+                    setattr(instance, self.attname, file_name)
+                    file = getattr(instance, self.attname)
         elif not file._committed:
             file.save(file.name, file.file, save=False)
 
         return file
 
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+
+        if self.deferred and not cls._meta.abstract:
+            post_save.connect(self._schedule_deferred_render, sender=cls, weak=False)
+
+    def render_image(self, instance, context):
+        """
+        Render the image of the context and save it into the storage.
+        :return: name of the file in the storage, or None if the field already contains the image of the context.
+        """
+        file_naming = self.file_naming
+        pattern = self.pattern(context=context)
+        fingerprint = get_render_key(pattern, format=self.format, **self.save_params) \
+            if file_naming == FileNaming.FINGERPRINT else None
+
+        if fingerprint:
+            if self._is_current_file(instance, fingerprint):
+                return None
+
+            file_name = self.generate_filename(instance, self.get_file_name(fingerprint))
+
+            if self.storage.exists(file_name):
+                return file_name
+
+        image = pattern.render_to_blob(format=self.format, **self.save_params)
+
+        if file_naming == FileNaming.CONTENT:
+            content_hash = sha256(image.getbuffer()).hexdigest()
+
+            if self._is_current_file(instance, content_hash):
+                return None
+
+            file_name = self.generate_filename(instance, self.get_file_name(content_hash))
+
+            if self.storage.exists(file_name):
+                return file_name
+        elif not fingerprint:
+            file_name = self.generate_filename(instance, self.get_file_name())
+
+        return self.storage.save(file_name, image, max_length=self.max_length)
+
+    def render_deferred(self, instance, context) -> Future:
+        """
+        Render the image in the pool of the deferred renderer and update the column of the field.
+        The instance isn't modified by the threads of the pool, it gets the name of the file
+        only if the render is already done, for example with IMAGE_PATTERN_DEFERRED_SYNC setting.
+        """
+        future = deferred_renderer.submit(
+            self._get_render_key(instance),
+            self._render_and_update,
+            instance,
+            context,
+        )
+
+        if future.done() and not future.exception() and future.result():
+            setattr(instance, self.attname, future.result())
+
+        return future
+
+    def get_render_state(self, instance) -> RenderState:
+        """
+        PENDING is known only in the process, which scheduled the render after the commit,
+        the other processes see EMPTY until the image is stored.
+        READY is checked in the database too, so it's seen by the instances loaded before the render is done.
+        """
+        if deferred_renderer.get_future(self._get_render_key(instance)):
+            state = RenderState.PENDING
+        elif getattr(instance, self.attname) or self._get_stored_file_name(instance):
+            state = RenderState.READY
+        else:
+            state = RenderState.EMPTY
+
+        return state
+
+    def get_render_future(self, instance):
+        """
+        :return: concurrent.futures.Future of the pending deferred render of the instance image or None.
+        """
+        return deferred_renderer.get_future(self._get_render_key(instance))
+
+    def _schedule_deferred_render(self, instance, using, **kwargs):
+        context_attname = self._get_deferred_context_attname()
+
+        if context_attname in instance.__dict__:
+            context = instance.__dict__.pop(context_attname)
+            transaction.on_commit(partial(self.render_deferred, instance, context), using=using)
+
+    def _render_and_update(self, instance, context):
+        file_name = self.render_image(instance, context)
+
+        if file_name:
+            type(instance)._default_manager.filter(pk=instance.pk).update(**{self.attname: file_name})
+
+        return file_name
+
+    def _get_stored_file_name(self, instance) -> Optional[str]:
+        if instance.pk is None:
+            return None
+
+        file_name = type(instance)._default_manager.filter(pk=instance.pk).values_list(self.attname, flat=True).first()
+        return cast(Optional[str], file_name)
+
+    def _is_current_file(self, instance, name: str) -> bool:
+        """
+        Whether the field contains the file named by the fingerprint or hash.
+        Only the base name is compared, because the directory of upload_to can depend on the date,
+        and the storage can add a suffix to the name.
+        """
+        current_file_name = getattr(instance, self.attname).name
+        return bool(current_file_name) and basename(current_file_name).startswith(name)
+
+    def _get_deferred_context_attname(self):
+        return '_{}_deferred_context'.format(self.attname)
+
+    def _get_render_key(self, instance):
+        return instance._meta.label, instance.pk, self.attname
+
     def should_be_created(self, instance):
         if self.should_be_created_callback:
             callback = self.should_be_created_callback
@@ -45,9 +282,8 @@ class ImagePatternField(ImageField):
         method = method or getattr(instance, self.should_be_created_instance_method, None)
         return method() if method else True
 
-    @staticmethod
-    def get_file_name():
-        return '{}.jpeg'.format(str(uuid4()))
+    def get_file_name(self, name=None):
+        return '{}.{}'.format(name or str(uuid4()), get_encoder(self.format).extension)
 
     def get_context(self, instance):
         if self.context:
@@ -67,6 +303,9 @@ class ImagePatternField(ImageField):
             'context': self.context,
             'should_be_created': self.should_be_created_callback,
             'save_params': self.save_params,
+            'deferred': self.deferred,
+            'format': self.format.value,
+            'file_naming': self.file_naming.value,
         })
 
         return name, path, args, kwargs
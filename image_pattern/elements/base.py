@@ -1,5 +1,7 @@
 from __future__ import annotations
 from typing import (
+    Any,
+    Mapping,
     Optional,
     Union,
     Tuple,
@@ -12,7 +14,10 @@ from enum import Enum
 from pydantic import BaseModel, Extra
 from six import add_metaclass
 
-from ..context import ContextVar
+from ..context import (
+    Bindable,
+    ContextVar,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from PIL.Image import Image as PillowImage
@@ -56,10 +61,40 @@ class ImageMode(str, Enum):
     RGBA = 'RGBA'
 
 
-class Drawer(BaseModel):
-    size: Tuple[int, int]
-    point: Point
-    start_point: Point
+class Location:
+    """
+    Mutable point of the drawers.
+    """
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x: int = 0, y: int = 0):
+        self.x = x
+        self.y = y
+
+    def to_tuple(self) -> Tuple[int, int]:
+        return self.x, self.y
+
+    def __repr__(self) -> str:
+        return 'Location(x={}, y={})'.format(self.x, self.y)
+
+
+class Drawer:
+    """
+    Element with the values bound to the context, which is created for every render.
+    The values are already validated by the element, so the drawers are plain objects.
+    """
+    __slots__ = ('size', 'point', 'start_point')
+
+    def __init__(
+            self,
+            size: Tuple[int, int],
+            point: Union[Point, Location],
+            start_point: Union[Point, Location],
+    ):
+        self.size = size
+        # The points are moved by the overlap resolution, so they are copied from the element.
+        self.point = Location(point.x, point.y)
+        self.start_point = Location(start_point.x, start_point.y)
 
     def draw(self, image: PillowImage) -> PillowImage:
         return image
@@ -69,19 +104,21 @@ T = TypeVar('T')
 
 
 @add_metaclass(ABCMeta)
-class Element(Generic[T], BaseModel):
+class Element(Generic[T], Bindable):
     point: Point
     horizontal_alignment: Union[HorizontalAlignment, ContextVar] = HorizontalAlignment.LEFT
     vertical_alignment: Union[VerticalAlignment, ContextVar] = VerticalAlignment.TOP
 
-    def collect_data(self, context: T):
-        return {
-            field: value.get_from_context(context) if isinstance(value, ContextVar) else value
-            for field, value in self._iter()
-        }
-
     @abstractmethod
-    def create_drawer(self, canvas: PillowImage, context: Optional[T] = None):
+    def create_drawer(
+            self,
+            canvas: PillowImage,
+            context: Optional[T] = None,
+            data: Optional[Mapping[str, Any]] = None,
+    ):
+        """
+        :param data: values of the fields returned by collect_data() for the context, if they are already collected.
+        """
         raise NotImplementedError  # pragma: no cover
 
     def _get_start_point(
@@ -94,10 +131,7 @@ class Element(Generic[T], BaseModel):
         width, height = size
         x = self._get_start_x(horizontal_alignment, width, **kwargs)
         y = self._get_start_y(vertical_alignment, height, **kwargs)
-        return Point(
-            x=x,
-            y=y,
-        )
+        return Location(x, y)
 
     def _get_start_x(self, horizontal_alignment: HorizontalAlignment, width: int, **kwargs):
         if horizontal_alignment == HorizontalAlignment.LEFT:
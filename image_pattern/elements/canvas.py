@@ -3,12 +3,14 @@ from typing import (
     Tuple,
     Union,
     TYPE_CHECKING,
+    cast,
 )
-from pydantic import BaseModel
 from PIL import Image
 
 from .base import ImageMode
+from ..memory import reserve_image
 from ..context import (
+    Bindable,
     ContextVar,
 )
 
@@ -16,11 +18,16 @@ if TYPE_CHECKING:  # pragma: no cover
     from PIL.Image import Image as PillowImage
 
 
-class Canvas(BaseModel):
+class Canvas(Bindable):
     _type: str = 'Canvas'
     size: Union[Tuple[int, int], ContextVar]
     _image_mode: ImageMode = ImageMode.RGB
 
     def get_image(self) -> PillowImage:
-        return Image.new(self._image_mode, self.size)
+        size = self.get_size()
+        reserve_image(size, self._image_mode)
+        return Image.new(self._image_mode, size)
+
+    def get_size(self, context=None) -> Tuple[int, int]:
+        return cast(Tuple[int, int], self.collect_data(context)['size'])
 
@@ -1,14 +1,21 @@
 from __future__ import annotations
 from typing import (
+    Callable,
     Optional,
     Tuple,
     Union,
     TYPE_CHECKING,
+    cast,
 )
 from io import BytesIO
 from pathlib import Path
+from struct import (
+    pack,
+    unpack,
+)
 from PIL import (
     Image,
+    ImageDraw,
     ImageEnhance,
 )
 
@@ -16,61 +23,220 @@ from .base import (
     Element,
     Drawer,
     ImageMode,
+    Location,
+    Point,
 )
 from .canvas import Canvas
-from ..size import resize_image
+from ..size import (
+    open_image,
+    resize_image,
+)
 from ..context import ContextVar
+from ..hooks import timed
+from ..memory import (
+    get_downscaled_count,
+    release,
+    reserve_image,
+)
+from ..images import (
+    tiles,
+    source_key,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from PIL.Image import Image as PillowImage
 
+RESIZED_BEFORE_CONVERSION_MODES = ('RGB', 'L')
+# Modes of the images, into which the solid rectangles are filled without an overlay image.
+FILLED_MODES = ('RGB',)
+
 
 class RectangleDrawer(Drawer):
-    brightness: Optional[float]
-    background_image: Union[BytesIO, Path, None]
-    background_color: Union[Tuple[int, int, int], Tuple[int, int, int, int]] = (255, 255, 255)
-    alpha: Optional[int]
+    __slots__ = ('brightness', 'background_image', 'background_color', 'alpha')
     _image_mode: ImageMode = ImageMode.RGBA
 
-    class Config:
-        arbitrary_types_allowed = True
+    def __init__(
+            self,
+            size: Tuple[int, int],
+            point: Union[Point, Location],
+            start_point: Union[Point, Location],
+            brightness: Optional[float] = None,
+            background_image: Union[BytesIO, Path, None] = None,
+            background_color: Union[Tuple[int, int, int], Tuple[int, int, int, int]] = (255, 255, 255),
+            alpha: Optional[int] = None,
+    ):
+        super().__init__(size, point, start_point)
+        self.brightness = brightness
+        self.background_image = background_image
+        self.background_color = background_color
+        self.alpha = alpha
 
     def draw(self, image: PillowImage) -> PillowImage:
+        if not self.background_image and self.background_color and image.mode in FILLED_MODES:
+            return self._fill(image)
+
         overlay_image = self.get_image()
         image.paste(overlay_image, self.start_point.to_tuple(), mask=overlay_image)
 
         return image
 
+    def get_color(self) -> Tuple[int, int, int, int]:
+        """
+        RGBA color of the solid rectangle, the same as the pixels of its image.
+        The brightness is applied as the blend of Pillow with the black image of the same alpha,
+        which computes in single precision and truncates the values.
+        """
+        color = self.background_color
+        red, green, blue, alpha = cast(Tuple[int, int, int, int], (*color, 255) if len(color) == 3 else color)
+
+        if self.brightness is not None:
+            factor = _to_single(self.brightness)
+            red, green, blue = (_enhance(value, factor) for value in (red, green, blue))
+
+        if self.alpha is not None:
+            alpha = self.alpha
+
+        return red, green, blue, alpha
+
+    def _fill(self, image: PillowImage) -> PillowImage:
+        """
+        Fill the region of the solid rectangle in the image, or blend it with the color if it's translucent.
+        The result is the same as the paste of the image of the rectangle with itself as the mask.
+        """
+        red, green, blue, alpha = self.get_color()
+        width, height = self.size
+        x, y = self.start_point.to_tuple()
+
+        if width <= 0 or height <= 0 or not alpha:
+            return image
+
+        if alpha == 255:
+            image.paste((red, green, blue), (x, y, x + width, y + height))
+        else:
+            ImageDraw.Draw(image, 'RGBA').rectangle(
+                (x, y, x + width - 1, y + height - 1),
+                fill=(red, green, blue, alpha),
+            )
+
+        return image
+
     def get_image(self) -> PillowImage:
+        """
+        The processed tiles of background images are shared between renders, so they must not be modified.
+        """
+        if self.background_image:
+            key = (source_key(self.background_image), self.size, self.brightness, self.alpha)
+            image = tiles.get(key)
+
+            if image is None:
+                downscaled_count = get_downscaled_count()
+                image = self._decode_image()
+
+                # The tile decoded at a reduced scale to fit into the budget of this render isn't shared,
+                # otherwise the other renders would get the degraded pixels.
+                if get_downscaled_count() == downscaled_count:
+                    tiles.set(key, image)
+
+            return image
+
+        return self._create_image()
+
+    def _decode_image(self) -> PillowImage:
+        with timed('decode'):
+            return self._create_image()
+
+    def _create_image(self, size: Optional[Tuple[int, int]] = None) -> PillowImage:
+        """
+        :param size: size of the image of a solid rectangle, the size of the rectangle by default.
+        The buffers of the images are accounted in the memory budget of the render,
+        every intermediate image is released after the next one is created.
+        """
+        resized = False
+
         if self.background_image:
-            image = Image.open(self.background_image)
+            image = open_image(self.background_image, self.size)
+            buffer = reserve_image(image.size, image.mode)
+
+            # The bands are resampled independently, so the images without alpha are converted after the resize,
+            # and the RGBA buffer has the size of the rectangle instead of the source image.
+            if image.mode in RESIZED_BEFORE_CONVERSION_MODES:
+                image, buffer = self._transform(image, buffer, self.size, image.mode, self._resize_image)
+                resized = True
         else:
             background_color = (
                 *self.background_color,
                 self.alpha,
             ) if self.background_color and self.alpha is not None and \
                  len(self.background_color) == 3 else self.background_color
-            image = Image.new(self._image_mode, self.size, background_color)
+            size = size or self.size
+            buffer = reserve_image(size, self._image_mode)
+            image = Image.new(self._image_mode, size, background_color)
+            # The solid image is created at its size.
+            resized = True
 
-        image = image.convert(self._image_mode) if not image.mode == self._image_mode else image
-        image = self._resize_image(image)
-        image = self._enhance(image)
+        if not image.mode == self._image_mode:
+            image, buffer = self._transform(
+                image,
+                buffer,
+                image.size,
+                self._image_mode,
+                lambda image: image.convert(self._image_mode),
+            )
 
-        return image
+        if not resized:
+            image, buffer = self._transform(image, buffer, self.size, self._image_mode, self._resize_image)
 
-    def _enhance(self, image: PillowImage) -> PillowImage:
         if self.brightness is not None:
-            image = ImageEnhance.Brightness(image).enhance(self.brightness)
+            # The enhancer blends the image with a black one of the same size.
+            degenerate_buffer = reserve_image(image.size, image.mode)
+            image, buffer = self._transform(
+                image,
+                buffer,
+                image.size,
+                image.mode,
+                lambda image: ImageEnhance.Brightness(image).enhance(self.brightness),
+            )
+            release(degenerate_buffer)
 
         if self.alpha is not None:
             image.putalpha(self.alpha)
 
         return image
 
+    @staticmethod
+    def _transform(
+            image: PillowImage,
+            buffer: int,
+            size: Tuple[int, int],
+            mode: str,
+            transform: Callable[[PillowImage], PillowImage],
+    ) -> Tuple[PillowImage, int]:
+        """
+        Create the next image of the size and mode and release the buffer of the previous one.
+        """
+        next_buffer = reserve_image(size, mode)
+        image = transform(image)
+        release(buffer)
+
+        return image, next_buffer
+
     def _resize_image(self, image: PillowImage) -> PillowImage:
         return resize_image(image, self.size)
 
 
+def _to_single(value: float) -> float:
+    return cast(float, unpack('f', pack('f', value))[0])
+
+
+def _enhance(value: int, factor: float) -> int:
+    enhanced = _to_single(factor * value)
+
+    if enhanced <= 0:
+        return 0
+
+    return 255 if enhanced >= 255 else int(enhanced)
+
+
 class Rectangle(Element, Canvas):
     _type: str = 'Rectangle'
     brightness: Union[float, ContextVar, None]
@@ -81,8 +247,8 @@ class Rectangle(Element, Canvas):
     class Config:
         arbitrary_types_allowed = True
 
-    def create_drawer(self, canvas: PillowImage, context=None):
-        data = self.collect_data(context)
+    def create_drawer(self, canvas: PillowImage, context=None, data=None):
+        data = self.collect_data(context) if data is None else data
         start_point = self._get_start_point(
             data['horizontal_alignment'],
             data['vertical_alignment'],
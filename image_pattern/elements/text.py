@@ -7,15 +7,13 @@ from typing import (
     TYPE_CHECKING,
 )
 from pathlib import Path
-from textwrap import wrap
-from PIL import (
-    ImageFont,
-    ImageDraw,
-)
+from PIL import ImageDraw
 from PIL.ImageFont import FreeTypeFont as PillowImageFont
 
 from .base import (
     Drawer,
+    Location,
+    Point,
     Position,
     HorizontalAlignment,
     VerticalAlignment,
@@ -24,32 +22,67 @@ from .base import (
 from ..context import (
     ContextVar,
 )
+from ..fonts import (
+    get_font,
+    get_metrics,
+    get_text_mask,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from PIL.Image import Image as PillowImage
 
 
 class TextDrawer(Drawer):
-    font: PillowImageFont
-    font_color: Tuple[int, int, int] = (0, 0, 0)
-    text: List[str]
-    line_height: int
-    horizontal_alignment: HorizontalAlignment = HorizontalAlignment.LEFT.value
-    vertical_alignment: VerticalAlignment = VerticalAlignment.TOP.value
-    margin: Position = Position()
+    __slots__ = (
+        'font',
+        'font_color',
+        'text',
+        'line_height',
+        'horizontal_alignment',
+        'vertical_alignment',
+        'margin',
+    )
+
+    def __init__(
+            self,
+            size: Tuple[int, int],
+            point: Union[Point, Location],
+            start_point: Union[Point, Location],
+            font: PillowImageFont,
+            text: List[str],
+            line_height: int,
+            font_color: Tuple[int, int, int] = (0, 0, 0),
+            horizontal_alignment: HorizontalAlignment = HorizontalAlignment.LEFT,
+            vertical_alignment: VerticalAlignment = VerticalAlignment.TOP,
+            margin: Optional[Position] = None,
+    ):
+        super().__init__(size, point, start_point)
+        self.font = font
+        self.font_color = font_color
+        self.text = text
+        self.line_height = line_height
+        self.horizontal_alignment = horizontal_alignment
+        self.vertical_alignment = vertical_alignment
+        self.margin = margin or Position()
 
     def draw(self, image: PillowImage) -> PillowImage:
         return self.draw_text(image, self.text, self.font)
 
     def draw_text(self, image: PillowImage, text: List[str], font: PillowImageFont):
         draw = ImageDraw.Draw(image)
+        metrics = get_metrics(font)
 
         for line_index, line in enumerate(text):
-            font_width, _ = font.getsize(line)
-            _, height_offset = font.getoffset(line)
+            font_width, _ = metrics.getsize(line)
+            _, height_offset = metrics.getoffset(line)
             x = self._get_x(font_width)
             y = self._get_y(line_index, self.line_height, height_offset)
-            draw.text((x, y), line, font=font, fill=self.font_color)
+
+            if draw.fontmode == 'L':
+                mask, (mask_x, mask_y) = get_text_mask(font, line)
+                draw.bitmap((x + mask_x, y + mask_y), mask, fill=self.font_color)
+            else:
+                draw.text((x, y), line, font=font, fill=self.font_color)
 
         return image
 
@@ -80,9 +113,6 @@ class TextDrawer(Drawer):
 
         return y + self.margin.top
 
-    class Config:
-        arbitrary_types_allowed = True
-
 
 class Text(Element):
     _type: str = 'Text'
@@ -97,8 +127,8 @@ class Text(Element):
         kwargs['margin'] = kwargs.get('margin', Position())
         super().__init__(**kwargs)
 
-    def create_drawer(self, canvas: PillowImage, context=None):
-        data = self.collect_data(context)
+    def create_drawer(self, canvas: PillowImage, context=None, data=None):
+        data = self.collect_data(context) if data is None else data
 
         if data['text']:
 
@@ -108,10 +138,11 @@ class Text(Element):
                 data['vertical_alignment'],
                 margin=data['margin'],
             )
-            font = ImageFont.truetype(str(self.font.absolute()), size=self.font_size, encoding='UTF-8')
+            font = get_font(data['font'], data['font_size'])
+            metrics = get_metrics(font)
             text = self._get_multiline_text(data['text'], font, bounded_width)
-            line_height = data['line_height'] or font.getsize(data['text'])[1]
-            size = font.getsize_multiline('\n'.join(text), spacing=line_height - data['font_size'])
+            line_height = data['line_height'] or metrics.getsize(data['text'])[1]
+            size = metrics.getsize_multiline('\n'.join(text), spacing=line_height - data['font_size'])
             start_point = self._get_start_point(
                 data['horizontal_alignment'],
                 data['vertical_alignment'],
@@ -160,11 +191,7 @@ class Text(Element):
 
     @staticmethod
     def _get_multiline_text(text, font: PillowImageFont, width: int) -> List[str]:
-        font_width, _ = font.getsize(text)
-        line_length = int((width / (font_width / len(text))))
-        text_lines = wrap(text, line_length)
-
-        return text_lines
+        return list(get_metrics(font).wrap(text, width))
 
     def _get_bounded_size(
             self,
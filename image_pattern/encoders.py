@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import (
+    Dict,
+    Optional,
+    Union,
+    TYPE_CHECKING,
+)
+from enum import Enum
+from PIL import Image
+from typing_extensions import Protocol
+
+if TYPE_CHECKING:  # pragma: no cover
+    from PIL.Image import Image as PillowImage
+
+
+class ImageFormat(str, Enum):
+    JPEG = 'JPEG'
+    PNG = 'PNG'
+    WEBP = 'WEBP'
+    AVIF = 'AVIF'
+
+
+class WritableFile(Protocol):
+    """
+    File object, into which the images are saved, such as BytesIO, a file or SinkWriter.
+    """
+
+    def write(self, data: bytes) -> int:
+        ...
+
+    def seek(self, offset: int, whence: int = ...) -> int:
+        ...
+
+    def tell(self) -> int:
+        ...
+
+
+class Encoder:
+    """
+    Saves images in the format with the preset params of PIL.Image.save(),
+    the params passed to save() override the preset ones.
+    :param palette: save images, which have no more than 256 colors, with a palette. It is lossless.
+    """
+
+    def __init__(
+            self,
+            image_format: ImageFormat,
+            extension: str,
+            content_type: str,
+            mode: Optional[str] = None,
+            palette: bool = False,
+            **save_kwargs
+    ):
+        self.format = image_format
+        self.extension = extension
+        self.content_type = content_type
+        self.mode = mode
+        self.palette = palette
+        self.save_kwargs = save_kwargs
+
+    def is_supported(self) -> bool:
+        Image.init()
+        return self.format.value in Image.SAVE
+
+    def save(self, image: PillowImage, fp: WritableFile, **save_kwargs):
+        if not self.is_supported():
+            raise ValueError('Format {} is not supported by the installed Pillow.'.format(self.format.value))
+
+        if self.mode and image.mode != self.mode:
+            image = image.convert(self.mode)
+
+        if self.palette:
+            image = to_palette(image)
+
+        image.save(
+            fp,
+            self.format.value,
+            **{
+                **self.save_kwargs,
+                **save_kwargs,
+            }
+        )
+
+
+ENCODERS: Dict[ImageFormat, Encoder] = {
+    ImageFormat.JPEG: Encoder(ImageFormat.JPEG, 'jpeg', 'image/jpeg', mode='RGB'),
+    ImageFormat.PNG: Encoder(ImageFormat.PNG, 'png', 'image/png', palette=True, compress_level=6),
+    ImageFormat.WEBP: Encoder(ImageFormat.WEBP, 'webp', 'image/webp', quality=80, method=4),
+    # AVIF is supported by Pillow plugins, such as pillow-avif-plugin.
+    ImageFormat.AVIF: Encoder(ImageFormat.AVIF, 'avif', 'image/avif', quality=75),
+}
+
+
+def get_encoder(image_format: Union[ImageFormat, str]) -> Encoder:
+    return ENCODERS[ImageFormat(image_format.upper())]
+
+
+def to_palette(image: PillowImage) -> PillowImage:
+    if image.mode not in ('RGB', 'L'):
+        return image
+
+    colors = image.getcolors(256)
+
+    if colors is None:
+        return image
+
+    palette = [channel for _, color in colors for channel in _to_rgb(color)]
+    palette_image = Image.new('P', (1, 1))
+    palette_image.putpalette(palette + palette[:3] * (256 - len(colors)))
+
+    # The colors are looked up in the palette with a reduced precision, so the close colors of antialiased edges
+    # can be mapped to a neighbour entry, then the image is saved without the palette to stay lossless.
+    palette_image = image.convert('RGB').quantize(palette=palette_image, dither=0)
+
+    if palette_image.convert(image.mode).tobytes() != image.tobytes():
+        return image
+
+    return palette_image
+
+
+def _to_rgb(color):
+    return (color, color, color) if isinstance(color, int) else color
@@ -0,0 +1,263 @@
+from __future__ import annotations
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from bisect import bisect_right
+from itertools import accumulate
+from os import fspath
+from pathlib import Path
+from re import compile as compile_regex
+from threading import Lock
+from weakref import (
+    WeakKeyDictionary,
+    ref,
+)
+from PIL import (
+    Image,
+    ImageDraw,
+    ImageFont,
+)
+from PIL.ImageFont import FreeTypeFont as PillowImageFont
+from PIL.Image import Image as PillowImage
+
+from .cache import (
+    CacheInfo,
+    LRUCache,
+)
+from .hooks import timed
+
+FONT_CACHE_SIZE = 128
+# Count of the measurements, which are kept for every font.
+METRICS_CACHE_SIZE = 4096
+# Size in bytes of the rasterized lines of text.
+MASK_CACHE_SIZE = 16 * 1024 * 1024
+
+fonts: LRUCache[PillowImageFont] = LRUCache(maxsize=FONT_CACHE_SIZE, name='fonts')
+masks: LRUCache[Tuple[PillowImage, Tuple[int, int]]] = LRUCache(
+    maxsize=MASK_CACHE_SIZE,
+    get_weight=lambda mask: mask[0].size[0] * mask[0].size[1],
+    name='masks',
+)
+_metrics: WeakKeyDictionary[PillowImageFont, FontMetrics] = WeakKeyDictionary()
+_metrics_lock = Lock()
+
+WORD_PATTERN = compile_regex(r'\S+')
+WHITESPACE_PATTERN = compile_regex(r'\s')
+
+
+class FontMetrics:
+    """
+    Memoized measurements of texts with the font, which repeat between renders for the same labels and names.
+    The results are shared, so they must not be modified.
+    The metrics are the values of a WeakKeyDictionary keyed by the font, so they refer to the font weakly,
+    otherwise the font would never be released.
+    """
+
+    def __init__(self, font: PillowImageFont, maxsize: int = METRICS_CACHE_SIZE):
+        self._font = ref(font)
+        self._values: LRUCache[tuple] = LRUCache(maxsize=maxsize)
+        # Advance widths of the characters and kerning of the pairs of characters, which are filled on the first use.
+        self._advances: Dict[str, float] = {}
+        self._kernings: Dict[str, float] = {}
+
+    @property
+    def font(self) -> PillowImageFont:
+        font = self._font()
+
+        if font is None:
+            raise ReferenceError('Font of the metrics is released.')
+
+        return font
+
+    def getsize(self, text: str) -> Tuple[int, int]:
+        return self._values.get_or_create(('size', text), lambda: self.font.getsize(text))
+
+    def getoffset(self, text: str) -> Tuple[int, int]:
+        return self._values.get_or_create(('offset', text), lambda: self.font.getoffset(text))
+
+    def getsize_multiline(self, text: str, spacing: int = 4) -> Tuple[int, int]:
+        return self._values.get_or_create(
+            ('size_multiline', text, spacing),
+            lambda: self.font.getsize_multiline(text, spacing=spacing),
+        )
+
+    def wrap(self, text: str, width: int) -> Tuple[str, ...]:
+        """
+        Lines of the text, which fit into the width.
+        """
+        return self._values.get_or_create(('wrap', text, width), lambda: self._wrap(text, width))
+
+    def info(self) -> CacheInfo:
+        return self._values.info()
+
+    def clear(self):
+        self._values.clear()
+
+    def get_width(self, text: str) -> int:
+        width, _ = self.getsize(text)
+        return width
+
+    def get_offsets(self, text: str) -> List[float]:
+        """
+        Estimated widths of all prefixes of the text, which are summed from the advance widths of the characters
+        and the kerning of their pairs.
+        """
+        widths = [self._get_advance(character) for character in text]
+
+        for index in range(1, len(text)):
+            widths[index] += self._get_kerning(text[index - 1:index + 1])
+
+        return [0, *accumulate(widths)]
+
+    def _wrap(self, text: str, width: int) -> Tuple[str, ...]:
+        """
+        Greedy line breaking: every line takes as many words as fit into the width,
+        and the words, which are wider than the width, are broken between characters.
+        """
+        text = WHITESPACE_PATTERN.sub(' ', text)
+        offsets = self.get_offsets(text)
+        words = [match.span() for match in WORD_PATTERN.finditer(text)]
+        starts = [start for start, _ in words]
+        ends = [end for _, end in words]
+        lines = []
+        index = 0
+
+        while index < len(words):
+            start = starts[index]
+            last_index = self._fit(text, offsets, start, ends, index, width)
+
+            if last_index < index:
+                character_ends = range(start + 1, ends[index] + 1)
+                end = character_ends[max(self._fit(text, offsets, start, character_ends, 0, width), 0)]
+                lines.append(text[start:end])
+
+                if end < ends[index]:
+                    starts[index] = end
+                else:
+                    index += 1
+            else:
+                lines.append(text[start:ends[last_index]])
+                index = last_index + 1
+
+        return tuple(lines)
+
+    def _fit(self, text: str, offsets: List[float], start: int, ends: Sequence[int], low: int, width: int) -> int:
+        """
+        Index of the last of ends, starting from low, up to which the text from start fits into the width,
+        or low - 1 if none fits.
+        """
+        index = bisect_right(ends, bisect_right(offsets, offsets[start] + width) - 1, low) - 1
+
+        while index >= low and not self._fits(text, offsets, start, ends[index], width):
+            index -= 1
+
+        while index + 1 < len(ends) and self._fits(text, offsets, start, ends[index + 1], width):
+            index += 1
+
+        return index
+
+    def _fits(self, text: str, offsets: List[float], start: int, end: int, width: int) -> bool:
+        estimate = offsets[end] - offsets[start]
+        # The real width differs from the sum of the advances only by the bearings of the edge glyphs,
+        # which are smaller than the size of the font, so the real width is measured only near the bound.
+        slack = self.font.size
+
+        if estimate + slack <= width:
+            return True
+        elif estimate - slack > width:
+            return False
+
+        return self.get_width(text[start:end]) <= width
+
+    def _get_advance(self, character: str) -> float:
+        advance = self._advances.get(character)
+
+        if advance is None:
+            advance = self._advances[character] = self._get_length(character)
+
+        return advance
+
+    def _get_kerning(self, pair: str) -> float:
+        kerning = self._kernings.get(pair)
+
+        if kerning is None:
+            kerning = self._kernings[pair] = self._get_length(pair) - sum(map(self._get_advance, pair))
+
+        return kerning
+
+    def _get_length(self, text: str) -> float:
+        # FreeTypeFont.getlength() is added in Pillow 8.0.
+        if hasattr(self.font, 'getlength'):
+            return float(self.font.getlength(text))
+
+        width, _ = self.font.getsize(text)
+        return float(width)
+
+
+def get_text_mask(font: PillowImageFont, text: str) -> Tuple[PillowImage, Tuple[int, int]]:
+    """
+    Return the rasterized line of text from the process-wide cache, as Pillow draws it:
+    the alpha mask, which is drawn with ImageDraw.bitmap() in the color of the text, and its offset
+    from the point of the text.
+    The masks are shared between renders, so they must not be modified.
+    """
+    key = (font.path, font.size, font.index, font.encoding, font.layout_engine, text)
+
+    return masks.get_or_create(key, lambda: _create_text_mask(font, text))
+
+
+def get_metrics(font: PillowImageFont) -> FontMetrics:
+    """
+    Return the measurements of the font, which live as long as the font.
+    """
+    metrics = _metrics.get(font)
+
+    if metrics is None:
+        with _metrics_lock:
+            metrics = _metrics.get(font)
+
+            if metrics is None:
+                metrics = _metrics[font] = FontMetrics(font)
+
+    return metrics
+
+
+def get_font(
+        font: Union[Path, str],
+        size: int,
+        encoding: str = 'UTF-8',
+        layout_engine: Optional[int] = None,
+) -> PillowImageFont:
+    """
+    Return the font from the process-wide registry, loading it on the first use.
+    The loaded fonts are shared between renders, so they must not be modified.
+    """
+    path = _resolve(fspath(font))
+    key = (path, size, encoding, layout_engine)
+
+    def load_font():
+        with timed('font'):
+            return ImageFont.truetype(path, size=size, encoding=encoding, layout_engine=layout_engine)
+
+    return fonts.get_or_create(key, load_font)
+
+
+def _create_text_mask(font: PillowImageFont, text: str) -> Tuple[PillowImage, Tuple[int, int]]:
+    mask, (offset_x, offset_y) = font.getmask2(text, 'L')
+    image = Image.new('L', mask.size)
+    ImageDraw.Draw(image).text((-offset_x, -offset_y), text, font=font, fill=255)
+
+    return image, (offset_x, offset_y)
+
+
+def _resolve(path: str) -> str:
+    """
+    The relative paths are resolved against the current working directory on every call,
+    so they are not memoized.
+    """
+    return str(Path(path).resolve())
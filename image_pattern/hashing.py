@@ -0,0 +1,175 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    FrozenSet,
+    Set,
+)
+from enum import Enum
+from hashlib import sha256
+from io import BytesIO
+from pathlib import Path
+from types import (
+    CodeType,
+    ModuleType,
+)
+from pydantic import BaseModel
+
+from .cache import LRUCache
+from .images import source_key
+
+FILE_DIGESTS_CACHE_SIZE = 1024
+# Size of the blocks, in which files are read for hashing.
+BLOCK_SIZE = 1024 * 1024
+
+file_digests: LRUCache[str] = LRUCache(maxsize=FILE_DIGESTS_CACHE_SIZE, name='file_digests')
+
+
+def get_digest(*values: Any) -> str:
+    """
+    Stable hash of the values, which is the same in all processes and between runs.
+    Models are hashed by their class and fields, files referenced by paths are hashed by their content,
+    functions by their qualified name, code, default arguments, values of the closure and referenced globals,
+    and modules and classes by their names.
+    Raises TypeError for values, which can't be hashed in a stable way.
+    """
+    digest = sha256()
+
+    for value in values:
+        _update(digest, value)
+
+    return digest.hexdigest()
+
+
+def get_file_digest(path: Path) -> str:
+    """
+    Hash of the content of the file, which is recomputed only when the modification time or size is changed.
+    """
+    def hash_file():
+        digest = sha256()
+
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(BLOCK_SIZE), b''):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    return file_digests.get_or_create(source_key(path), hash_file)
+
+
+def _update(digest, value: Any, functions: FrozenSet[int] = frozenset()):
+    """
+    :param functions: ids of the functions, which are being hashed, so the recursive references are hashed by name.
+    """
+    if isinstance(value, Enum):
+        _write(digest, 'e', _get_qualname(type(value)))
+        _update(digest, value.value, functions)
+    elif value is None or isinstance(value, (bool, int, float)):
+        _write(digest, 'v', repr(value))
+    elif isinstance(value, str):
+        _write(digest, 's', value)
+    elif isinstance(value, bytes):
+        _write(digest, 'b', sha256(value).hexdigest())
+    elif isinstance(value, BytesIO):
+        _write(digest, 'b', sha256(value.getbuffer()).hexdigest())
+    elif isinstance(value, Path):
+        _write(digest, 'f', get_file_digest(value) if value.is_file() else str(value))
+    elif isinstance(value, BaseModel):
+        _write(digest, 'm', _get_qualname(type(value)))
+        _update(digest, dict(value._iter()), functions)
+    elif isinstance(value, dict):
+        _write(digest, 'd', str(len(value)))
+
+        for key in sorted(value, key=str):
+            _update(digest, key, functions)
+            _update(digest, value[key], functions)
+    elif isinstance(value, (list, tuple)):
+        _write(digest, 'l', str(len(value)))
+
+        for item in value:
+            _update(digest, item, functions)
+    elif isinstance(value, ModuleType):
+        _write(digest, 'o', value.__name__)
+    elif isinstance(value, type):
+        _write(digest, 't', _get_qualname(value))
+    elif callable(value) and hasattr(value, '__code__'):
+        if id(value) in functions:
+            # The recursive function refers to itself.
+            _write(digest, 'r', _get_qualname(value))
+        else:
+            _update_function(digest, value, functions | {id(value)})
+    else:
+        raise TypeError('Value of type {} can\'t be hashed.'.format(type(value).__name__))
+
+
+def _update_function(digest, function: Any, functions: FrozenSet[int]):
+    """
+    Hash the code of the function with the nested code of its comprehensions and inner functions,
+    its default arguments, the values of its closure and the values of the globals, which it refers to.
+    """
+    code = function.__code__
+    _write(digest, 'c', _get_qualname(function))
+    _update_code(digest, code)
+    _update(digest, function.__defaults__, functions)
+    _update(digest, function.__kwdefaults__, functions)
+
+    closure = function.__closure__ or ()
+    _write(digest, 'k', str(len(closure)))
+
+    for cell in closure:
+        try:
+            contents = cell.cell_contents
+        except ValueError:  # The variable isn't assigned yet.
+            _write(digest, 'k', '')
+        else:
+            _update(digest, contents, functions)
+
+    # The names of the code are the names of the globals and attributes, only the globals have values.
+    namespace = function.__globals__
+
+    for name in sorted(_get_names(code)):
+        if name in namespace:
+            _write(digest, 'g', name)
+            _update(digest, namespace[name], functions)
+
+
+def _update_code(digest, code: CodeType):
+    _write(digest, 'c', sha256(code.co_code).hexdigest())
+    _update(digest, code.co_names)
+    _write(digest, 'l', str(len(code.co_consts)))
+
+    for const in code.co_consts:
+        _update_const(digest, const)
+
+
+def _update_const(digest, const: Any):
+    if isinstance(const, CodeType):
+        _update_code(digest, const)
+    elif isinstance(const, (tuple, frozenset)):
+        items = sorted(const, key=repr) if isinstance(const, frozenset) else const
+        _write(digest, 'l', str(len(items)))
+
+        for item in items:
+            _update_const(digest, item)
+    else:
+        # The other constants are literals, which are distinguished by repr().
+        _write(digest, 'v', repr(const))
+
+
+def _get_names(code: CodeType) -> Set[str]:
+    names = set(code.co_names)
+
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _get_names(const)
+
+    return names
+
+
+def _write(digest, tag: str, value: str):
+    data = value.encode('utf-8')
+    digest.update('{}{}:'.format(tag, len(data)).encode('ascii'))
+    digest.update(data)
+
+
+def _get_qualname(value: Any) -> str:
+    return '{}.{}'.format(value.__module__, value.__qualname__)
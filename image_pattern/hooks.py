@@ -0,0 +1,202 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from bisect import bisect_left
+from contextvars import ContextVar as LocalVar
+from threading import Lock
+from time import perf_counter
+
+from .cache import get_cache_stats
+
+# Upper bounds in seconds of the buckets of the latency histograms.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Hook = Callable[['Event'], None]
+
+hooks: List[Hook] = []
+_pattern: LocalVar[Optional[type]] = LocalVar('image_pattern_pattern', default=None)
+
+
+class Event(NamedTuple):
+    """
+    Timed stage of the render.
+    :param stage: name of the stage, such as render, layer, layout, element, font, decode or encode.
+    :param pattern: class of the rendered pattern, or None for the stages outside of a render.
+    :param duration: duration of the stage in seconds.
+    :param labels: details of the stage, such as the index of the layer or the type of the element.
+    """
+    stage: str
+    pattern: Optional[type]
+    duration: float
+    labels: Mapping[str, Any]
+
+
+def add_hook(hook: Hook):
+    """
+    Add the hook, which is called with every Event of the renders of the process.
+    The stages aren't timed at all while there are no hooks.
+    """
+    hooks.append(hook)
+
+
+def remove_hook(hook: Hook):
+    hooks.remove(hook)
+
+
+def timed(stage: str, pattern: Optional[type] = None, **labels):
+    """
+    Context manager, which emits the event of the stage to the hooks.
+    :param pattern: class of the pattern, which is set for the nested stages.
+    """
+    if not hooks:
+        return _null_span
+
+    return _Span(stage, pattern, labels)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Cumulative counts of the buckets by their upper bounds, as Prometheus exports them.
+        """
+        bounds = [*self.buckets, float('inf')]
+        cumulative_counts = [sum(self.counts[:index + 1]) for index in range(len(self.counts))]
+
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': list(zip(bounds, cumulative_counts)),
+        }
+
+
+class MetricsAggregator:
+    """
+    Hook, which aggregates the events in the process:
+    counters and latency histograms of the stages by pattern class.
+
+        aggregator = MetricsAggregator()
+        add_hook(aggregator)
+        ...
+        metrics = aggregator.get_metrics()
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._peak_memory: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def __call__(self, event: Event):
+        pattern = _get_pattern_name(event.pattern)
+        peak_memory = event.labels.get('peak_memory')
+
+        with self._lock:
+            histogram = self._histograms.get((pattern, event.stage))
+
+            if histogram is None:
+                histogram = self._histograms[(pattern, event.stage)] = Histogram(self.buckets)
+
+            histogram.observe(event.duration)
+
+            if peak_memory is not None:
+                self._peak_memory[pattern] = max(self._peak_memory.get(pattern, 0), peak_memory)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        :return: dict with the histograms of the stages as {pattern: {stage: histogram}},
+        the max estimated size of the pixel buffers of a render in bytes as {pattern: size}
+        and the statistics of the caches as {cache: stats}.
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            for (pattern, stage), histogram in self._histograms.items():
+                stages.setdefault(pattern, {})[stage] = histogram.to_dict()
+
+            peak_memory = dict(self._peak_memory)
+
+        return {
+            'stages': stages,
+            'peak_memory': peak_memory,
+            'caches': get_cache_stats(),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._peak_memory.clear()
+
+
+class _Span:
+    __slots__ = ('stage', 'pattern', 'labels', 'started', 'token')
+
+    def __init__(self, stage: str, pattern: Optional[type], labels: Dict[str, Any]):
+        self.stage = stage
+        self.pattern = pattern
+        self.labels = labels
+
+    def set(self, **labels):
+        self.labels.update(labels)
+
+    def __enter__(self):
+        if self.pattern is not None:
+            self.token = _pattern.set(self.pattern)
+
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        event = Event(
+            stage=self.stage,
+            pattern=_pattern.get(),
+            duration=perf_counter() - self.started,
+            labels=self.labels,
+        )
+
+        if self.pattern is not None:
+            _pattern.reset(self.token)
+
+        for hook in list(hooks):
+            hook(event)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **labels):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def _get_pattern_name(pattern: Optional[type]) -> str:
+    return '{}.{}'.format(pattern.__module__, pattern.__qualname__) if pattern else ''
+
+
+_null_span = _NullSpan()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from typing import (
+    Hashable,
+    Union,
+    TYPE_CHECKING,
+)
+from hashlib import sha1
+from io import BytesIO
+from os import (
+    fspath,
+    stat,
+)
+from pathlib import Path
+
+from .cache import LRUCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    from PIL.Image import Image as PillowImage
+
+IMAGE_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def get_image_weight(image: PillowImage) -> int:
+    width, height = image.size
+    return int(width * height) * len(image.getbands())
+
+
+tiles: LRUCache[PillowImage] = LRUCache(
+    maxsize=IMAGE_CACHE_SIZE,
+    get_weight=get_image_weight,
+    name='tiles',
+)
+
+
+def source_key(source: Union[BytesIO, Path, str]) -> Hashable:
+    """
+    Identity of the image source: the path with the modification time and size of the file,
+    or the hash of the content for in-memory images.
+    """
+    if isinstance(source, BytesIO):
+        return 'blob', sha1(source.getbuffer()).hexdigest()
+
+    path = fspath(source)
+    source_stat = stat(path)
+    return 'file', path, source_stat.st_mtime_ns, source_stat.st_size
@@ -1,7 +1,6 @@
 from __future__ import annotations
 from typing import (
     List,
-    Tuple,
     Union,
     Optional,
     Callable,
@@ -9,33 +8,28 @@ from typing import (
 )
 from pydantic import BaseModel
 
+from .compositing import composite
 from .context import Context
 from .elements import (
+    Canvas,
     Rectangle,
     Text,
-    Point,
+)
+from .elements.base import Drawer
+from .hooks import timed
+from .layout import (
+    LayerLayout,
+    create_element_layout,
+)
+from .spatial import (
+    BoxIndex,
+    get_cell_size,
 )
 
 if TYPE_CHECKING:  # pragma: no cover
     from PIL.Image import Image
 
 
-class Area(BaseModel):
-    point: Point
-    size: Tuple[int, int]
-
-    def intersect(self, point: Point):
-        width, height = self.size
-        return self.point.x + width > point.x >= self.point.x and self.point.y + height > point.y >= self.point.y
-
-    def get_offset(self, point: Point):
-        width, height = self.size
-        width_offset = 0
-        height_offset = self.point.y + height - point.y
-
-        return width_offset, height_offset
-
-
 def default_exist(context=None):
     return True
 
@@ -54,30 +48,56 @@ class Layer(BaseModel):
         exist = exist or default_exist
         super().__init__(elements=elements, exist=exist)
 
+    def is_static(self) -> bool:
+        return self.exist is default_exist and all(element.is_static() for element in self.elements)
+
     def enhance_image(self, image: Image, context: Optional[Context] = None) -> Image:
-        drawers = sorted(
-            [element.create_drawer(image, context=context) for element in self.elements],
-            key=lambda drawer: drawer.start_point.x + drawer.start_point.y,
+        with timed('layer.layout'):
+            drawers = arrange_drawers([element.create_drawer(image, context=context) for element in self.elements])
+
+        return self.draw(image, drawers)
+
+    def arrange(self, canvas: Union[Image, Canvas], context: Optional[Context] = None) -> LayerLayout:
+        """
+        Layout of the elements without drawing them.
+        :param canvas: image or canvas with the size, in which the elements are placed.
+        """
+        values = [element.collect_data(context) for element in self.elements]
+        drawers = [
+            element.create_drawer(canvas, context=context, data=data)
+            for element, data in zip(self.elements, values)
+        ]
+        drawing_order = arrange_drawers(drawers)
+        layer_layout = LayerLayout.construct(
+            elements=[
+                create_element_layout(type(element).__name__, drawer, data)
+                for element, drawer, data in zip(self.elements, drawers, values)
+            ],
         )
-        filled_areas: List[Area] = []
+        layer_layout._drawers = drawing_order
+
+        return layer_layout
+
+    def draw(self, image: Image, drawers: List[Drawer]) -> Image:
+        return composite(image, drawers)
+
 
-        for drawer in drawers:
-            intersections = [area for area in filled_areas if area.intersect(drawer.start_point)]
+def arrange_drawers(drawers: List[Drawer]) -> List[Drawer]:
+    """
+    Sort the drawers in the drawing order and move every drawer, which starts inside the area of a previous one,
+    down under the last of these areas.
+    """
+    drawers = sorted(drawers, key=lambda drawer: drawer.start_point.x + drawer.start_point.y)
+    filled_areas = BoxIndex(get_cell_size(drawer.size for drawer in drawers))
 
-            for area in intersections:
-                width_offset, height_offset = area.get_offset(drawer.start_point)
+    for drawer in drawers:
+        area = filled_areas.find_last(drawer.start_point.x, drawer.start_point.y)
 
-                drawer.start_point.x += width_offset
-                drawer.start_point.y += height_offset
-                drawer.point.x += width_offset
-                drawer.point.y += height_offset
+        if area:
+            height_offset = area[3] - drawer.start_point.y
+            drawer.start_point.y += height_offset
+            drawer.point.y += height_offset
 
-            image = drawer.draw(image)
-            filled_areas.append(
-                Area(
-                    point=drawer.start_point,
-                    size=drawer.size,
-                ),
-            )
+        filled_areas.add(drawer.start_point.x, drawer.start_point.y, *drawer.size)
 
-        return image
+    return drawers
@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from io import BytesIO
+from pydantic import (
+    BaseModel,
+    PrivateAttr,
+)
+
+from .elements.base import (
+    Drawer,
+    Point,
+)
+from .elements.text import TextDrawer
+
+
+class ElementLayout(BaseModel):
+    """
+    Place of the element on the canvas after the overlap resolution.
+    :param type: class name of the element.
+    :param point: anchor point of the element.
+    :param start_point: top left corner of the element box.
+    :param size: size of the element box.
+    :param lines: wrapped lines of text elements.
+    :param values: values of the element fields with the context variables resolved.
+    """
+    type: str
+    point: Point
+    start_point: Point
+    size: Tuple[int, int]
+    lines: Optional[List[str]]
+    values: Dict[str, Any]
+
+    def get_box(self) -> Tuple[int, int, int, int]:
+        width, height = self.size
+        return self.start_point.x, self.start_point.y, self.start_point.x + width, self.start_point.y + height
+
+    class Config:
+        json_encoders = {
+            BytesIO: lambda blob: None,
+        }
+
+
+class LayerLayout(BaseModel):
+    exists: bool = True
+    elements: List[ElementLayout] = []
+    # Drawers of the elements in the drawing order.
+    _drawers: List[Drawer] = PrivateAttr(default_factory=list)
+
+    def get_drawers(self) -> List[Drawer]:
+        if len(self._drawers) != len(self.elements):
+            raise ValueError('Layout has no drawers, only the layout returned by Pattern.layout() can be rendered.')
+
+        return self._drawers
+
+    class Config:
+        json_encoders = ElementLayout.Config.json_encoders
+
+
+class Layout(BaseModel):
+    """
+    Result of the layout pass of the pattern: where the elements land and how big they are.
+    It is computed without allocating the canvas or decoding the images, serializable with .dict() and .json(),
+    and can be passed to Pattern.render() to draw the image without computing it again.
+    """
+    size: Tuple[int, int]
+    layers: List[LayerLayout] = []
+
+    def get_elements(self) -> List[ElementLayout]:
+        return [element for layer in self.layers for element in layer.elements]
+
+    class Config:
+        json_encoders = ElementLayout.Config.json_encoders
+
+
+def create_element_layout(element_type: str, drawer: Drawer, values: Mapping[str, Any]) -> ElementLayout:
+    """
+    The layout is made of the values computed by the drawer, so it's constructed without the validation.
+    """
+    return ElementLayout.construct(
+        type=element_type,
+        point=Point.construct(x=drawer.point.x, y=drawer.point.y),
+        start_point=Point.construct(x=drawer.start_point.x, y=drawer.start_point.y),
+        size=drawer.size,
+        lines=drawer.text if isinstance(drawer, TextDrawer) else None,
+        values=dict(values),
+    )
@@ -0,0 +1,176 @@
+from __future__ import annotations
+from typing import (
+    Iterator,
+    Optional,
+    Tuple,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar as LocalVar
+from enum import Enum
+from math import ceil
+from typing_extensions import TypedDict
+
+# Reduced scales, at which the decoders of JPEG images can decode them.
+DRAFT_REDUCTIONS = (1, 2, 4, 8)
+# Bytes per pixel of the single band modes, the pixels of the other modes are stored in 4 bytes.
+PIXEL_SIZES = {
+    '1': 1,
+    'L': 1,
+    'P': 1,
+}
+
+
+class BudgetPolicy(str, Enum):
+    REJECT = 'REJECT'
+    DOWNSCALE = 'DOWNSCALE'
+
+
+class MemoryBudgetExceeded(MemoryError):
+    pass
+
+
+class _Settings(TypedDict):
+    budget: Optional[int]
+    policy: BudgetPolicy
+
+
+_settings: _Settings = {
+    'budget': None,
+    'policy': BudgetPolicy.REJECT,
+}
+_account: LocalVar[Optional[MemoryAccount]] = LocalVar('image_pattern_memory', default=None)
+
+
+def configure(budget: Optional[int] = None, policy: BudgetPolicy = BudgetPolicy.REJECT):
+    """
+    Set the budget of the pixel buffers of a render in bytes, None for no budget.
+    :param policy: with BudgetPolicy.REJECT the render, which exceeds the budget, raises MemoryBudgetExceeded.
+    With BudgetPolicy.DOWNSCALE the background images are decoded at a reduced scale, which fits into the budget,
+    and only the renders, which don't fit even so, raise MemoryBudgetExceeded.
+    """
+    _settings['budget'] = budget
+    _settings['policy'] = BudgetPolicy(policy)
+
+
+class MemoryAccount:
+    """
+    Estimated size of the pixel buffers allocated by a render.
+    Pillow allocates the buffers outside of Python, so they are accounted by the size and mode of the images.
+    downscaled is the count of the images, which are decoded at a reduced scale to fit into the budget.
+    """
+    __slots__ = ('budget', 'policy', 'allocated', 'peak', 'downscaled')
+
+    def __init__(self, budget: Optional[int] = None, policy: BudgetPolicy = BudgetPolicy.REJECT):
+        self.budget = budget
+        self.policy = policy
+        self.allocated = 0
+        self.peak = 0
+        self.downscaled = 0
+
+    def get_available(self) -> Optional[int]:
+        return None if self.budget is None else self.budget - self.allocated
+
+    def reserve(self, size: int):
+        if self.budget is not None and self.allocated + size > self.budget:
+            raise MemoryBudgetExceeded(
+                'Render needs {} bytes of pixel buffers, which exceeds the budget of {} bytes.'.format(
+                    self.allocated + size,
+                    self.budget,
+                ),
+            )
+
+        self.allocated += size
+        self.peak = max(self.peak, self.allocated)
+
+    def release(self, size: int):
+        self.allocated -= size
+
+
+@contextmanager
+def track_memory() -> Iterator[MemoryAccount]:
+    """
+    Account the pixel buffers of the render with the configured budget.
+    The nested renders are accounted in the account of the outer one, so the renders inside the block
+    are accounted together, and the peak of their buffers is the peak attribute of the yielded account.
+    """
+    account = _account.get()
+
+    if account is not None:
+        yield account
+        return
+
+    account = MemoryAccount(budget=_settings['budget'], policy=_settings['policy'])
+    token = _account.set(account)
+
+    try:
+        yield account
+    finally:
+        _account.reset(token)
+
+
+def get_account() -> Optional[MemoryAccount]:
+    return _account.get()
+
+
+def reserve_image(size: Tuple[int, int], mode: str) -> int:
+    """
+    Reserve the buffer of the image, which is going to be allocated, in the account of the current render.
+    :return: size of the buffer in bytes, which is passed to release() when the image is dropped.
+    """
+    width, height = size
+    buffer_size = width * height * get_pixel_size(mode)
+    account = _account.get()
+
+    if account is not None:
+        account.reserve(buffer_size)
+
+    return buffer_size
+
+
+def release(size: int):
+    account = _account.get()
+
+    if account is not None:
+        account.release(size)
+
+
+def get_downscaled_count() -> int:
+    """
+    Count of the images of the current render, which are decoded at a reduced scale to fit into the budget.
+    """
+    account = _account.get()
+    return 0 if account is None else account.downscaled
+
+
+def count_downscaled():
+    account = _account.get()
+
+    if account is not None:
+        account.downscaled += 1
+
+
+def get_draft_reduction(image_size: Tuple[int, int], mode: str, reserved: int = 0) -> int:
+    """
+    The least reduction of the decode of the image, at which it fits into the budget of the current render
+    with the downscaling policy, or 1.
+    :param reserved: size of the buffers, which are allocated with the decoded image.
+    """
+    account = _account.get()
+
+    if account is None or account.budget is None or account.policy != BudgetPolicy.DOWNSCALE:
+        return 1
+
+    available = account.budget - account.allocated - reserved
+
+    image_width, image_height = image_size
+    pixel_size = get_pixel_size(mode)
+
+    for reduction in DRAFT_REDUCTIONS:
+        if ceil(image_width / reduction) * ceil(image_height / reduction) * pixel_size <= available:
+            return reduction
+
+    return DRAFT_REDUCTIONS[-1]
+
+
+def get_pixel_size(mode: str) -> int:
+    return PIXEL_SIZES.get(mode, 4)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    TYPE_CHECKING,
+)
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    FIRST_COMPLETED,
+    wait,
+)
+from io import BytesIO
+from itertools import islice
+from os import cpu_count
+
+from .context import ContextVar
+from .elements import Text
+from .encoders import ImageFormat
+from .fonts import get_font
+from .patterns import (
+    Pattern,
+    get_image_blob,
+    static_bases,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from PIL.Image import Image as PillowImage
+    from .context import Context
+
+DEFAULT_CHUNK_SIZE = 16
+# Count of the chunks submitted to the pool in advance for each worker.
+CHUNKS_PER_WORKER = 2
+
+_worker: Dict = {}
+
+
+def render_parallel(
+        pattern_class: Type[Pattern],
+        contexts: Iterable[Context],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        ordered: bool = True,
+        format: Union[ImageFormat, str] = ImageFormat.JPEG,
+        **save_kwargs
+) -> Iterator[Tuple[Context, BytesIO]]:
+    """
+    Render the pattern for every context of the batch in a pool of processes.
+    The pattern class and its static layers are sent to each worker once, when the worker starts,
+    then the contexts are sent in chunks, so only a few chunks are in flight at any moment.
+    The pattern class must be importable by the workers.
+    :param pattern_class: class of the pattern to render.
+    :param contexts: iterable of contexts, can be a generator.
+    :param workers: count of the processes, the count of CPUs by default.
+    :param chunk_size: count of the contexts sent to a worker at once.
+    :param ordered: yield the results in the order of the contexts, otherwise as soon as they are ready.
+    :param format: format of the image, one of ImageFormat.
+    :param save_kwargs: params for PIL.Image.save(), such as quality, optimize and progressive.
+    :return: iterator of (context, BytesIO object of image) pairs.
+    """
+    workers = workers or cpu_count() or 1
+    save_kwargs = dict(save_kwargs, format=format)
+    iter_contexts = iter(contexts)
+    chunks = iter(lambda: list(islice(iter_contexts, chunk_size)), [])
+    static_base = _get_static_base(pattern_class)
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(pattern_class, static_base, save_kwargs),
+    ) as executor:
+        pending: Dict[Future, List[Context]] = {}
+
+        def submit(count: int):
+            for chunk in islice(chunks, count):
+                pending[executor.submit(_render_chunk, chunk)] = chunk
+
+        submit(workers * CHUNKS_PER_WORKER)
+
+        while pending:
+            if ordered:
+                future = next(iter(pending))
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(future for future in pending if future in done)
+
+            chunk = pending.pop(future)
+            blobs = future.result()
+            submit(1)
+
+            for context, blob in zip(chunk, blobs):
+                yield context, BytesIO(blob)
+
+
+def _get_static_base(pattern_class: Type[Pattern]) -> Optional[Tuple[PillowImage, int]]:
+    pattern = pattern_class.parse_obj({})
+    base = static_bases.get_or_create(pattern._get_base_key(), pattern._render_static_layers)
+    return base if base[1] else None
+
+
+def _initialize_worker(
+        pattern_class: Type[Pattern],
+        static_base: Optional[Tuple[PillowImage, int]],
+        save_kwargs: Dict,
+):
+    """
+    Create the pattern in the worker, seed it with the static base rendered in the parent
+    and load the fonts of the texts, which don't depend on the context.
+    The tiles of the background images are cached by the first renders of the worker.
+    """
+    pattern = pattern_class.parse_obj({})
+
+    if static_base:
+        static_bases.set(pattern._get_base_key(), static_base)
+
+    for layer in pattern.layers:
+        for element in layer.elements:
+            if isinstance(element, Text) and not isinstance(element.font, ContextVar) and \
+                    not isinstance(element.font_size, ContextVar):
+                get_font(element.font, element.font_size)
+
+    _worker['pattern'] = pattern
+    _worker['save_kwargs'] = save_kwargs
+
+
+def _render_chunk(contexts: List[Context]) -> List[bytes]:
+    pattern: Pattern = _worker['pattern']
+    save_kwargs: Dict = _worker['save_kwargs']
+
+    return [
+        get_image_blob(pattern._render(context), **save_kwargs).getvalue()
+        for context in contexts
+    ]
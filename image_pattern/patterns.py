@@ -1,18 +1,64 @@
 from __future__ import annotations
 from typing import (
     TYPE_CHECKING,
+    BinaryIO,
+    Hashable,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Tuple,
+    Union,
 )
 from io import BytesIO
 from pydantic import BaseModel
 
-from .context import Context
-from .elements import Canvas
+from .aio import run_in_executor
+from .cache import LRUCache
+from .context import (
+    Context,
+    ContextVar,
+    make_key,
+)
+from .elements import (
+    Canvas,
+    Rectangle,
+)
+from .hooks import timed
+from .encoders import (
+    ImageFormat,
+    get_encoder,
+)
+from .images import (
+    get_image_weight,
+    source_key,
+)
 from .layers import Layer
+from .memory import (
+    get_downscaled_count,
+    reserve_image,
+    track_memory,
+)
+from .layout import (
+    Layout,
+    LayerLayout,
+)
+from .sinks import SinkWriter
 
 if TYPE_CHECKING:
     from PIL import Image
+    from PIL.Image import Image as PillowImage
+    from .render_cache import RenderCache
+
+STATIC_CACHE_SIZE = 32 * 1024 * 1024
+# Size in bytes of the last distinct results, which Pattern.render_many() reuses for identical contexts.
+RENDER_MANY_RESULTS_SIZE = 16 * 1024 * 1024
+
+static_bases: LRUCache[Tuple[PillowImage, int]] = LRUCache(
+    maxsize=STATIC_CACHE_SIZE,
+    get_weight=lambda base: get_image_weight(base[0]),
+    name='static_bases',
+)
 
 
 class Pattern(BaseModel):
@@ -20,32 +66,229 @@ class Pattern(BaseModel):
     canvas: Canvas
     layers: List[Layer] = []
 
-    def render(self):
-        image = self.canvas.get_image()
+    def render(self, layout: Optional[Layout] = None):
+        """
+        :param layout: layout returned by layout(), which is drawn instead of being computed again.
+        :return: PIL.Image object.
+        """
+        return self._render(self.context, layout=layout)
+
+    def layout(self, context: Optional[Context] = None) -> Layout:
+        """
+        Compute the boxes of the elements, the wrapped lines of texts and the resolved values,
+        without allocating the canvas and drawing the image.
+        :param context: context of the layout, by default the context of the pattern.
+        """
+        context = self.context if context is None else context
 
-        for layer in self.layers:
-            if layer.exist(context=self.context):
-                image = layer.enhance_image(image, context=self.context)
+        with timed('layout', pattern=type(self)):
+            size = self.canvas.get_size(context)
+            canvas = Canvas(size=size)
+            layout = Layout.construct(
+                size=size,
+                layers=[
+                    layer.arrange(canvas, context=context) if layer.exist(context=context)
+                    else LayerLayout.construct(exists=False)
+                    for layer in self.layers
+                ],
+            )
 
-        return image
+        return layout
 
-    def render_to_blob(self, **save_kwargs):
+    def render_to_blob(
+            self,
+            format: Union[ImageFormat, str] = ImageFormat.JPEG,
+            cache: Optional[RenderCache] = None,
+            **save_kwargs
+    ):
         """
+        :param format: format of the image, one of ImageFormat.
+        :param cache: RenderCache, which returns the image rendered earlier for the same pattern and context.
         :param save_kwargs: params for PIL.Image.save(), such as quality, optimize and progressive.
+        They override the preset params of the format.
         :return: BytesIO object of image.
         """
-        image = self.render()
-        image_blob = get_image_blob(image, **save_kwargs)
+        if cache is not None:
+            return cache.render_to_blob(self, format=format, **save_kwargs)
+
+        with timed('render_to_blob', pattern=type(self)):
+            image = self.render()
+            image_blob = get_image_blob(image, format=format, **save_kwargs)
 
         return image_blob
 
+    def render_into(
+            self,
+            sink: Union[BinaryIO, int, bytearray, memoryview],
+            format: Union[ImageFormat, str] = ImageFormat.JPEG,
+            **save_kwargs
+    ) -> int:
+        """
+        Render the image and encode it straight into the sink, without an intermediate blob.
+        :param sink: writable file object, such as file, socket file or HttpResponse, open file descriptor,
+        or bytearray or memoryview, which is filled from the start and must be large enough for the image.
+        :param format: format of the image, one of ImageFormat.
+        :param save_kwargs: params for PIL.Image.save(), such as quality, optimize and progressive.
+        :return: count of the written bytes.
+        """
+        with timed('render_into', pattern=type(self)):
+            return save_image(self.render(), sink, format=format, **save_kwargs)
+
+    async def render_async(self) -> PillowImage:
+        """
+        Asynchronous render(), the image is rendered in the thread pool of image_pattern.aio.
+        """
+        return await run_in_executor(self.render)
+
+    async def render_to_blob_async(
+            self,
+            format: Union[ImageFormat, str] = ImageFormat.JPEG,
+            **save_kwargs
+    ) -> BytesIO:
+        """
+        Asynchronous render_to_blob(), the image is rendered and encoded in the thread pool of image_pattern.aio.
+        """
+        return await run_in_executor(self.render_to_blob, format=format, **save_kwargs)
+
+    @classmethod
+    def render_many(
+            cls,
+            contexts: Iterable[Context],
+            blob: bool = True,
+            format: Union[ImageFormat, str] = ImageFormat.JPEG,
+            **save_kwargs
+    ) -> Iterator[Tuple[Context, Union[BytesIO, PillowImage]]]:
+        """
+        Render the pattern for every context of the batch.
+        The pattern is created once for the whole batch and the results are yielded as soon as they are rendered,
+        so the memory usage doesn't depend on the size of the batch.
+        The results of identical contexts are rendered once, while they are among the last distinct ones.
+        :param contexts: iterable of contexts, can be a generator.
+        :param blob: yield BytesIO objects as render_to_blob() if True, otherwise PIL.Image objects as render().
+        :param format: format of the image, one of ImageFormat.
+        :param save_kwargs: params for PIL.Image.save(), such as quality, optimize and progressive.
+        :return: iterator of (context, image) pairs.
+        """
+        # The canvas and layers are the defaults of the class.
+        pattern = cls.parse_obj({})
+        results: LRUCache[Union[bytes, PillowImage]] = LRUCache(
+            maxsize=RENDER_MANY_RESULTS_SIZE,
+            get_weight=lambda result: len(result) if blob else get_image_weight(result),
+        )
+
+        for context in contexts:
+            key = make_key(context)
+            result = results.get(key) if key is not None else None
+
+            if result is None:
+                with timed('render_many', pattern=cls):
+                    result = pattern._render(context)
+                    result = get_image_blob(result, format=format, **save_kwargs).getvalue() if blob else result
+
+                if key is not None:
+                    results.set(key, result)
+
+            yield context, BytesIO(result) if blob else result.copy()
+
+    def _render(self, context: Optional[Context], layout: Optional[Layout] = None) -> PillowImage:
+        with timed('render', pattern=type(self)) as span, track_memory() as account:
+            image, static_layers_count = self._get_base_image()
+
+            for index, layer in enumerate(self.layers[static_layers_count:], static_layers_count):
+                with timed('layer', index=index):
+                    if layout is not None:
+                        layer_layout = layout.layers[index]
+
+                        if layer_layout.exists:
+                            image = layer.draw(image, layer_layout.get_drawers())
+                    elif layer.exist(context=context):
+                        image = layer.enhance_image(image, context=context)
+
+            span.set(peak_memory=account.peak)
+
+        return image
+
+    def _get_base_image(self) -> Tuple[PillowImage, int]:
+        """
+        Canvas with the bottom layers, which don't depend on the context, already drawn,
+        and the count of these layers.
+        The base is rendered once per pattern class, unless the canvas or layers are passed to the object.
+        """
+        if self.__fields_set__ & {'canvas', 'layers'}:
+            return self.canvas.get_image(), 0
+
+        key = self._get_base_key()
+        base = static_bases.get(key)
+
+        if base is None:
+            downscaled_count = get_downscaled_count()
+            base = self._render_static_layers()
+
+            # The base with the backgrounds decoded at a reduced scale to fit into the budget isn't shared.
+            if get_downscaled_count() == downscaled_count:
+                static_bases.set(key, base)
+
+        base_image, static_layers_count = base
+        reserve_image(base_image.size, base_image.mode)
+
+        return base_image.copy(), static_layers_count
+
+    def _get_base_key(self) -> Hashable:
+        """
+        Key of the base: the pattern class and the sources of the background images of the static layers,
+        so the base is rendered again, when one of their files is changed.
+        """
+        sources: List[Hashable] = []
+
+        if self.canvas.is_static():
+            for layer in self.layers:
+                if not layer.is_static():
+                    break
+
+                for element in layer.elements:
+                    background_image = element.background_image if isinstance(element, Rectangle) else None
+
+                    if background_image and not isinstance(background_image, ContextVar):
+                        sources.append(source_key(background_image))
+
+        return type(self), tuple(sources)
+
+    def _render_static_layers(self) -> Tuple[PillowImage, int]:
+        image = self.canvas.get_image()
+        static_layers_count = 0
+
+        if self.canvas.is_static():
+            for layer in self.layers:
+                if not layer.is_static():
+                    break
+
+                image = layer.enhance_image(image)
+                static_layers_count += 1
+
+        return image, static_layers_count
+
+
+def save_image(
+        image: Image,
+        sink: Union[BinaryIO, int, bytearray, memoryview],
+        format: Union[ImageFormat, str] = ImageFormat.JPEG,
+        **save_kwargs
+) -> int:
+    writer = SinkWriter(sink)
+    encoder = get_encoder(format)
+
+    with timed('encode', format=encoder.format.value):
+        encoder.save(
+            image,
+            writer,
+            **save_kwargs,
+        )
+
+    return writer.written
+
 
-def get_image_blob(image: Image, **save_kwargs):
+def get_image_blob(image: Image, format: Union[ImageFormat, str] = ImageFormat.JPEG, **save_kwargs):
     blob = BytesIO()
-    image.save(
-        blob,
-        'JPEG',
-        **save_kwargs,
-    )
+    save_image(image, blob, format=format, **save_kwargs)
 
     return blob
@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import (
+    List,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+from io import BytesIO
+from os import (
+    fspath,
+    makedirs,
+    remove,
+    replace,
+    scandir,
+    utime,
+)
+from os.path import (
+    dirname,
+    join,
+)
+from tempfile import mkstemp
+from threading import Lock
+
+from . import __version__
+from .encoders import (
+    ImageFormat,
+    get_encoder,
+)
+from .hashing import get_digest
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pathlib import Path
+    from .patterns import Pattern
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+# Part of the max size, to which the cache is reduced by the eviction.
+EVICTION_RATIO = 0.9
+TEMPORARY_SUFFIX = '.tmp'
+
+
+class RenderCache:
+    """
+    Persistent cache of the encoded images in a local directory, which can be shared by several processes.
+    The images are stored by the hash of the pattern definition, the context with the content of the referenced files
+    and the encoder settings, in the directories sharded by the first characters of the hash.
+    The files are written atomically, and the least recently used ones are removed, when the total size
+    of the cache exceeds the max size.
+    """
+
+    def __init__(self, directory: Union[Path, str], max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = fspath(directory)
+        self.max_size = max_size
+        self._size: Optional[int] = None
+        self._lock = Lock()
+
+    def render_to_blob(
+            self,
+            pattern: Pattern,
+            format: Union[ImageFormat, str] = ImageFormat.JPEG,
+            **save_kwargs
+    ) -> BytesIO:
+        key = self.get_key(pattern, format=format, **save_kwargs)
+        data = self.get(key) if key else None
+
+        if data is None:
+            blob: BytesIO = pattern.render_to_blob(format=format, **save_kwargs)
+
+            if key:
+                self.set(key, blob.getvalue())
+        else:
+            blob = BytesIO(data)
+
+        return blob
+
+    def get_key(
+            self,
+            pattern: Pattern,
+            format: Union[ImageFormat, str] = ImageFormat.JPEG,
+            **save_kwargs
+    ) -> Optional[str]:
+        return get_render_key(pattern, format=format, **save_kwargs)
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._get_path(key)
+
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+
+            # The modification time marks the recently used files for the eviction.
+            utime(path)
+        except FileNotFoundError:
+            return None
+
+        return data
+
+    def set(self, key: str, data: bytes):
+        path = self._get_path(key)
+        directory = dirname(path)
+        makedirs(directory, exist_ok=True)
+        descriptor, temporary_path = mkstemp(dir=directory, suffix=TEMPORARY_SUFFIX)
+
+        try:
+            with open(descriptor, 'wb') as file:
+                file.write(data)
+
+            replace(temporary_path, path)
+        except BaseException:
+            remove(temporary_path)
+            raise
+
+        self._add_size(len(data))
+
+    def get_size(self) -> int:
+        return sum(size for _, _, size in self._scan())
+
+    def evict(self, max_size: Optional[int] = None):
+        """
+        Remove the least recently used files, until the size of the cache is not greater than the max size.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        files = sorted(self._scan(), key=lambda file: file[1])
+        size = sum(file_size for _, _, file_size in files)
+
+        for path, _, file_size in files:
+            if size <= max_size:
+                break
+
+            try:
+                remove(path)
+            except FileNotFoundError:
+                pass
+
+            size -= file_size
+
+        with self._lock:
+            self._size = size
+
+    def clear(self):
+        self.evict(max_size=0)
+
+    def _add_size(self, size: int):
+        with self._lock:
+            if self._size is None:
+                self._size = self.get_size()
+            else:
+                self._size += size
+
+            should_be_evicted = self._size > self.max_size
+
+        if should_be_evicted:
+            # Other processes write into the directory too, so the eviction scans it again.
+            self.evict(max_size=int(self.max_size * EVICTION_RATIO))
+
+    def _get_path(self, key: str) -> str:
+        return join(self.directory, key[:2], key[2:4], key)
+
+    def _scan(self) -> List[Tuple[str, float, int]]:
+        files = []
+
+        for shard in _scan_directories(self.directory):
+            for subshard in _scan_directories(shard):
+                with scandir(subshard) as entries:
+                    for entry in entries:
+                        if entry.is_file() and not entry.name.endswith(TEMPORARY_SUFFIX):
+                            try:
+                                stat = entry.stat()
+                            except FileNotFoundError:
+                                continue
+
+                            files.append((entry.path, stat.st_mtime, stat.st_size))
+
+        return files
+
+
+def get_render_key(
+        pattern: Pattern,
+        format: Union[ImageFormat, str] = ImageFormat.JPEG,
+        **save_kwargs
+) -> Optional[str]:
+    """
+    Stable hash of the render: the pattern definition, the context with the content of the referenced files
+    and the encoder settings.
+    :return: hash of the render, or None if the pattern or context have values, which can't be hashed.
+    """
+    encoder = get_encoder(format)
+
+    try:
+        return get_digest(__version__, pattern, encoder.format, encoder.save_kwargs, save_kwargs)
+    except TypeError:
+        return None
+
+
+def _scan_directories(path: str) -> List[str]:
+    try:
+        with scandir(path) as entries:
+            return [entry.path for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return []
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Union,
+)
+from io import (
+    SEEK_CUR,
+    SEEK_SET,
+    UnsupportedOperation,
+)
+from os import write
+
+
+class SinkWriter:
+    """
+    Writable file object over the sink, which counts the written bytes.
+    The sink can be a writable file object, an open file descriptor, or a bytearray or memoryview,
+    which is filled from the start.
+    It has no fileno() method, so Pillow writes the encoded chunks into it instead of the file descriptor.
+    The writer isn't seekable, the position is only reported, as the count of the written bytes.
+    """
+
+    def __init__(self, sink: Union[Any, int, bytearray, memoryview]):
+        self.sink = sink
+        self.written = 0
+
+        if isinstance(sink, (bytearray, memoryview)):
+            self._buffer = memoryview(sink).cast('B')
+            self._write = self._write_to_buffer
+        elif isinstance(sink, int):
+            self._write = self._write_to_descriptor
+        elif hasattr(sink, 'write'):
+            self._write = sink.write
+        else:
+            raise TypeError('Sink must be a writable file object, file descriptor, bytearray or memoryview.')
+
+    def write(self, data) -> int:
+        self._write(data)
+        size = len(data)
+        self.written += size
+        return size
+
+    def tell(self) -> int:
+        return self.written
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        position = offset + self.written if whence == SEEK_CUR else offset
+
+        if whence not in (SEEK_SET, SEEK_CUR) or position != self.written:
+            raise UnsupportedOperation('Sink is not seekable.')
+
+        return self.written
+
+    def flush(self):
+        if hasattr(self.sink, 'flush'):
+            self.sink.flush()
+
+    def _write_to_buffer(self, data):
+        end = self.written + len(data)
+
+        if end > len(self._buffer):
+            raise ValueError('Image does not fit into the buffer of {} bytes.'.format(len(self._buffer)))
+
+        self._buffer[self.written:end] = data
+
+    def _write_to_descriptor(self, data):
+        data = memoryview(data)
+
+        while data:
+            data = data[write(self.sink, data):]
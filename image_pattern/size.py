@@ -1,31 +1,124 @@
 from __future__ import annotations
 from typing import (
+    BinaryIO,
     Tuple,
     Optional,
-    TYPE_CHECKING,
+    TypeVar,
+    Union,
 )
 from math import ceil
+from pathlib import Path
+from PIL import Image
 
-if TYPE_CHECKING:  # pragma: no cover
-    from PIL import Image
+from .memory import (
+    count_downscaled,
+    get_draft_reduction,
+    get_pixel_size,
+)
+
+Number = TypeVar('Number', int, float)
+
+# The decoder is asked for a reduced-scale decode when the image is shrunk at least this many times.
+DRAFT_REDUCTION = 2
+
+
+def open_image(
+        source: Union[BinaryIO, Path, str],
+        size: Tuple[int, int],
+):
+    """
+    Open the image, which will be scaled to cover the size.
+    If the image is much larger than the size, decoders that support it (JPEG) decode it
+    at a reduced scale that is still not smaller than the scaled image.
+    They decode it at a smaller scale, if the image doesn't fit into the memory budget of the render otherwise.
+    """
+    image = Image.open(source)
+    image_width, image_height = image.size
+    scaling_factor = get_scaling_factor(image.size, size)
+    draft_size = None
+
+    if scaling_factor * DRAFT_REDUCTION <= 1:
+        draft_size = (ceil(image_width * scaling_factor), ceil(image_height * scaling_factor))
+
+    width, height = size
+    # The decoded image is resized, while it's still allocated.
+    reduction = get_draft_reduction(image.size, image.mode, reserved=width * height * get_pixel_size(image.mode))
+
+    if reduction > 1:
+        budget_size = (max(image_width // reduction, 1), max(image_height // reduction, 1))
+
+        if not draft_size or budget_size[0] < draft_size[0] or budget_size[1] < draft_size[1]:
+            draft_size = (min(draft_size[0], budget_size[0]), min(draft_size[1], budget_size[1])) if draft_size \
+                else budget_size
+            count_downscaled()
+
+    if draft_size:
+        image.draft(None, draft_size)
+
+    return image
 
 
 def resize_image(
         image: Image,
         size: Tuple[int, int],
         center: Optional[Tuple[int, int]] = None,  # TODO: Do center position in Rectangle
+        reducing_gap: Optional[float] = None,
 ):
     """
     Crop and resize the image depending on the center and size.
-    !!! Warning. Image argument is not immutable.
+    The crop box is computed in the source coordinates, so only the visible region
+    of the image is resampled, in a single pass.
+    :param reducing_gap: optimization of PIL.Image.resize(), the image is first reduced
+    by an integer factor when it is larger than the size at least this many times.
     """
-    # Proportional resizing
-    image, center = scale_image(image, size, center=center)
-    image = crop_image(image, size, center)
-    # Purpose resizing
-    image.resize(size)
+    box = get_crop_box(image.size, size, center=center)
 
-    return image
+    return image.resize(size, box=box, reducing_gap=reducing_gap)
+
+
+def get_crop_box(
+        image_size: Tuple[int, int],
+        size: Tuple[int, int],
+        center: Optional[Tuple[int, int]] = None,
+) -> Tuple[float, float, float, float]:
+    """
+    Region of the source image, which is visible after the proportional scaling and cropping,
+    the same as scale_image() and crop_image() in sequence.
+    """
+    image_width, image_height = image_size
+    width, height = size
+
+    scaling_factor = get_scaling_factor(image_size, size)
+    scaling_width = ceil(image_width * scaling_factor)
+    scaling_height = ceil(image_height * scaling_factor)
+    width_factor = scaling_width / image_width
+    height_factor = scaling_height / image_height
+
+    center = center or (int(image_width / 2), int(image_height / 2))
+    center_width, center_height = center
+    left, top = 0, 0
+
+    if scaling_width > width or scaling_height > height:
+        left = _get_crop_start(center_width * scaling_factor, width, scaling_width)
+        top = _get_crop_start(center_height * scaling_factor, height, scaling_height)
+
+    return (
+        left / width_factor,
+        top / height_factor,
+        (left + width) / width_factor,
+        (top + height) / height_factor,
+    )
+
+
+def _get_crop_start(center: float, length: int, scaling_length: int) -> int:
+    half_length = int(length / 2)
+    start, _ = correct_size(
+        center - half_length,
+        center + half_length,
+        0,
+        scaling_length,
+    )
+    return min(round(start), scaling_length - length)
 
 
 def scale_image(
@@ -34,17 +127,23 @@ def scale_image(
         center: Optional[Tuple[int, int]] = None,
 ):
     image_width, image_height = image.size
-    width, height = size
 
-    scaling_factor = max([width / image_width, height / image_height])
+    scaling_factor = get_scaling_factor(image.size, size)
     scaling_width = ceil(image_width * scaling_factor)
     scaling_height = ceil(image_height * scaling_factor)
 
     center = center or (int(image_width / 2), int(image_height / 2))
     center_width, center_height = center
-    center = (center_width * scaling_factor, center_height * scaling_factor)
+    scaling_center = (center_width * scaling_factor, center_height * scaling_factor)
 
-    return image.resize((scaling_width, scaling_height)), center
+    return image.resize((scaling_width, scaling_height)), scaling_center
+
+
+def get_scaling_factor(image_size: Tuple[int, int], size: Tuple[int, int]) -> float:
+    image_width, image_height = image_size
+    width, height = size
+
+    return max([width / image_width, height / image_height])
 
 
 def crop_image(
@@ -85,11 +184,11 @@ def crop_image(
 
 
 def correct_size(
-        min_value: int,
-        max_value: int,
-        min_purpose_value: int,
-        max_purpose_value: int,
-):
+        min_value: Number,
+        max_value: Number,
+        min_purpose_value: Number,
+        max_purpose_value: Number,
+) -> Tuple[Number, Number]:
     if min_value < min_purpose_value:
         correction = min_purpose_value - min_value
         min_value = min_purpose_value
@@ -0,0 +1,77 @@
+from __future__ import annotations
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+Box = Tuple[int, int, int, int]
+
+MIN_CELL_SIZE = 16
+# Boxes overlapping more cells, such as backgrounds, are kept in a separate list instead of the cells.
+MAX_BOX_CELLS = 1024
+
+
+class BoxIndex:
+    """
+    Index of the boxes, which finds the last added box containing a point.
+    The boxes are kept in the cells of a uniform grid, which they overlap,
+    so a query checks only the boxes of the cell of the point instead of all boxes.
+    """
+
+    def __init__(self, cell_size: int = MIN_CELL_SIZE):
+        self.cell_size = max(cell_size, 1)
+        self._cells: Dict[Tuple[int, int], List[Tuple[int, Box]]] = {}
+        self._large_boxes: List[Tuple[int, Box]] = []
+        self._count = 0
+
+    def add(self, x: int, y: int, width: int, height: int):
+        if width <= 0 or height <= 0:
+            return
+
+        cell_size = self.cell_size
+        item = (self._count, (x, y, x + width, y + height))
+        cells_x = range(x // cell_size, (x + width - 1) // cell_size + 1)
+        cells_y = range(y // cell_size, (y + height - 1) // cell_size + 1)
+        self._count += 1
+
+        if len(cells_x) * len(cells_y) > MAX_BOX_CELLS:
+            self._large_boxes.append(item)
+        else:
+            for cell_x in cells_x:
+                for cell_y in cells_y:
+                    self._cells.setdefault((cell_x, cell_y), []).append(item)
+
+    def find_last(self, x: int, y: int) -> Optional[Box]:
+        cell_size = self.cell_size
+        items = [
+            item
+            for item in (
+                _find_last(self._cells.get((x // cell_size, y // cell_size), ()), x, y),
+                _find_last(self._large_boxes, x, y),
+            )
+            if item is not None
+        ]
+
+        return max(items)[1] if items else None
+
+
+def get_cell_size(sizes: Iterable[Tuple[int, int]]) -> int:
+    """
+    Median side of the boxes, so a typical box overlaps a few cells and a cell contains a few boxes.
+    """
+    sides = sorted(side for size in sizes for side in size if side > 0)
+    return max(sides[len(sides) // 2], MIN_CELL_SIZE) if sides else MIN_CELL_SIZE
+
+
+def _find_last(items: Sequence[Tuple[int, Box]], x: int, y: int) -> Optional[Tuple[int, Box]]:
+    for item in reversed(items):
+        left, top, right, bottom = item[1]
+
+        if left <= x < right and top <= y < bottom:
+            return item
+
+    return None
@@ -263,3 +263,25 @@ class OffsetPattern(Pattern):
             )
         ),
     ]
+
+
+class BackgroundContext(Context):
+    background_image: Path
+
+
+class BackgroundPattern(Pattern):
+    canvas: Canvas = Canvas(
+        size=(500, 500),
+    )
+    layers: List[Layer] = [
+        Layer(
+            Rectangle(
+                background_image=BackgroundContext.var('background_image'),
+                size=(500, 500),
+                point=Point(
+                    x=0,
+                    y=0,
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+from asyncio import (
+    gather,
+    run,
+)
+from image_pattern import aio
+
+from .patterns import (
+    SmallTestPattern,
+    SmallTestPatternContext,
+)
+
+
+def _create_pattern(text):
+    return SmallTestPattern(
+        context=SmallTestPatternContext(
+            text=text,
+            background_color=(3, 202, 252),
+            horizontal_alignment='CENTER',
+            vertical_alignment='CENTER',
+        ),
+    )
+
+
+def test_render_to_blob_async():
+    patterns = [_create_pattern(text) for text in ['ICE', 'BMO', 'JAKE']]
+
+    async def render():
+        return await gather(*[pattern.render_to_blob_async(quality=95) for pattern in patterns])
+
+    aio.configure(max_workers=2, concurrency=1)
+
+    try:
+        blobs = run(render())
+    finally:
+        aio.configure(max_workers=aio.DEFAULT_MAX_WORKERS, concurrency=aio.DEFAULT_CONCURRENCY)
+
+    for pattern, blob in zip(patterns, blobs):
+        assert blob.getvalue() == pattern.render_to_blob(quality=95).getvalue()
+
+
+def test_render_async():
+    pattern = _create_pattern('ICE')
+    image = run(pattern.render_async())
+
+    assert image.tobytes() == pattern.render().tobytes()
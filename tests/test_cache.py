@@ -0,0 +1,211 @@
+from __future__ import annotations
+from gc import collect
+from io import BytesIO
+from os.path import join
+from pathlib import Path
+from shutil import copyfile
+from weakref import ref
+from PIL import (
+    Image,
+    ImageDraw,
+)
+from image_pattern.cache import LRUCache
+from image_pattern.fonts import (
+    FontMetrics,
+    fonts,
+    get_font,
+    get_metrics,
+    get_text_mask,
+    masks,
+)
+from image_pattern.images import (
+    tiles,
+    source_key,
+)
+
+from .patterns import (
+    ComplexPattern,
+    ComplexContext,
+)
+from .settings import ASSETS_PATH
+
+FONT_PATH = join(ASSETS_PATH, 'IBMPlexSans-Regular.ttf')
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.info().hits == 3
+    assert cache.info().misses == 0
+
+
+def test_lru_cache_weight():
+    cache = LRUCache(maxsize=10, get_weight=len)
+    cache.set('a', 'xxxxxx')
+    cache.set('b', 'xxxxxx')
+    cache.set('c', 'x' * 11)
+
+    assert 'a' not in cache
+    assert 'c' not in cache
+    assert cache.info().size == 6
+
+    cache.maxsize = 5
+
+    assert len(cache) == 0
+
+
+def test_lru_cache_get_or_create():
+    cache = LRUCache(maxsize=2)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return object()
+
+    value = cache.get_or_create('key', factory)
+
+    assert cache.get_or_create('key', factory) is value
+    assert len(calls) == 1
+    assert cache.info().misses == 1
+    assert cache.info().hits == 1
+
+    cache.clear()
+
+    assert cache.info() == (0, 0, 0, 0, 2)
+
+
+def test_font_registry():
+    fonts.clear()
+    font = get_font(FONT_PATH, 32)
+
+    assert get_font(join(ASSETS_PATH, '..', 'assets', 'IBMPlexSans-Regular.ttf'), 32) is font
+    assert get_font(FONT_PATH, 33) is not font
+    assert fonts.info().hits == 1
+    assert fonts.info().misses == 2
+
+
+def test_font_registry_relative_path(tmp_path, monkeypatch):
+    copyfile(join(ASSETS_PATH, 'IBMPlexSans-Bold.ttf'), tmp_path / 'IBMPlexSans-Regular.ttf')
+    monkeypatch.chdir(ASSETS_PATH)
+    font = get_font('IBMPlexSans-Regular.ttf', 32)
+    monkeypatch.chdir(tmp_path)
+
+    assert get_font('IBMPlexSans-Regular.ttf', 32) is not font
+    assert get_font('IBMPlexSans-Regular.ttf', 32).path == str(tmp_path / 'IBMPlexSans-Regular.ttf')
+
+
+def test_font_metrics():
+    font = get_font(FONT_PATH, 32)
+    metrics = get_metrics(font)
+    metrics.clear()
+
+    assert get_metrics(font) is metrics
+    assert metrics.getsize('Finn') == font.getsize('Finn')
+    assert metrics.getsize('Finn') == font.getsize('Finn')
+    assert metrics.getoffset('Finn') == font.getoffset('Finn')
+    assert metrics.getsize_multiline('Finn\nJake', spacing=8) == font.getsize_multiline('Finn\nJake', spacing=8)
+    assert metrics.info().hits == 1
+    assert metrics.info().misses == 3
+    assert metrics.wrap('Finn the human', 150) is metrics.wrap('Finn the human', 150)
+
+
+def test_font_metrics_evicted_font():
+    fonts.clear()
+    maxsize = fonts.maxsize
+    fonts.maxsize = 1
+
+    try:
+        font = get_font(FONT_PATH, 40)
+        get_metrics(font).getsize('Finn')
+        font_reference = ref(font)
+        del font
+        get_font(FONT_PATH, 41)
+        collect()
+
+        assert font_reference() is None
+    finally:
+        fonts.maxsize = maxsize
+
+
+def test_font_metrics_size():
+    metrics = FontMetrics(get_font(FONT_PATH, 32), maxsize=2)
+
+    for text in ['a', 'b', 'c']:
+        metrics.getsize(text)
+
+    assert metrics.info().length == 2
+
+
+def test_text_mask():
+    masks.clear()
+    font = get_font(FONT_PATH, 32)
+
+    for mode in ['RGB', 'RGBA']:
+        expected = Image.new(mode, (200, 100), (10, 20, 30))
+        image = expected.copy()
+        ImageDraw.Draw(expected).text((7, 11), 'Jake Ag', font=font, fill=(250, 128, 3))
+        mask, (offset_x, offset_y) = get_text_mask(font, 'Jake Ag')
+        ImageDraw.Draw(image).bitmap((7 + offset_x, 11 + offset_y), mask, fill=(250, 128, 3))
+
+        assert image.tobytes() == expected.tobytes()
+
+    assert get_text_mask(get_font(FONT_PATH, 32), 'Jake Ag') is get_text_mask(font, 'Jake Ag')
+    assert get_text_mask(get_font(FONT_PATH, 33), 'Jake Ag') is not get_text_mask(font, 'Jake Ag')
+    assert masks.info().misses == 2
+
+
+def test_background_image_cache():
+    tiles.clear()
+    context = ComplexContext(
+        left_image=join(ASSETS_PATH, 'Finn-the-human.jpg'),
+        right_image=join(ASSETS_PATH, 'Jake-the-dog.jpg'),
+        title='FINN THE HUMAN',
+        layer_exists=True,
+    )
+    first_image = ComplexPattern(context=context).render()
+    second_image = ComplexPattern(context=context).render()
+
+    assert tiles.info().misses == 2
+    assert tiles.info().hits == 2
+    assert first_image.tobytes() == second_image.tobytes()
+
+
+def test_source_key():
+    path = join(ASSETS_PATH, 'Finn-the-human.jpg')
+
+    with open(path, 'rb') as file:
+        content = file.read()
+
+    assert source_key(BytesIO(content)) == source_key(BytesIO(content))
+    assert source_key(BytesIO(content)) != source_key(BytesIO(content[:-1]))
+    assert source_key(path) == source_key(Path(path))
+
+
+def test_font_metrics_wrap():
+    metrics = get_metrics(get_font(FONT_PATH, 32))
+    text = 'Finn the Human and Jake the Dog go on an adventure in the Land of Ooo'
+
+    for width in [200, 400, 1000]:
+        lines = metrics.wrap(text, width)
+
+        assert ' '.join(lines) == text
+        assert all(metrics.get_width(line) <= width for line in lines)
+        assert all(
+            metrics.get_width('{} {}'.format(line, next_line.split()[0])) > width
+            for line, next_line in zip(lines, lines[1:])
+        )
+
+    lines = metrics.wrap('Adventure', 50)
+
+    assert ''.join(lines) == 'Adventure'
+    assert len(lines) > 1
+    assert all(metrics.get_width(line) <= 50 for line in lines)
+    assert metrics.wrap(' Finn\nthe  human ', 1000) == ('Finn the  human',)
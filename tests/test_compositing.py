@@ -0,0 +1,118 @@
+from __future__ import annotations
+from os.path import join
+from random import Random
+from PIL import Image
+from pytest import (
+    fixture,
+    importorskip,
+    raises,
+)
+from image_pattern import compositing
+from image_pattern.compositing import (
+    CompositingBackend,
+    configure,
+)
+from image_pattern.elements import Point
+from image_pattern.elements.rectangle import RectangleDrawer
+from image_pattern.elements.text import TextDrawer
+from image_pattern.fonts import get_font
+from image_pattern.layers import Layer
+
+from .patterns import (
+    ComplexContext,
+    ComplexPattern,
+)
+from .settings import ASSETS_PATH
+
+importorskip('numpy')
+
+CANVAS_SIZE = (300, 200)
+
+
+@fixture()
+def numpy_backend():
+    configure(CompositingBackend.NUMPY, min_batch_size=2)
+    yield
+    configure()
+
+
+def _create_drawers(random, count):
+    left_image = join(ASSETS_PATH, 'Finn-the-human.jpg')
+    font = get_font(join(ASSETS_PATH, 'IBMPlexSans-Regular.ttf'), 16)
+    drawers = []
+
+    for index in range(count):
+        x, y = random.randrange(-50, CANVAS_SIZE[0]), random.randrange(-50, CANVAS_SIZE[1])
+        values = dict(
+            size=(random.randrange(1, 120), random.randrange(1, 80)),
+            point=Point(x=x, y=y),
+            start_point=Point(x=x, y=y),
+        )
+
+        if index % 10 == 9:
+            drawers.append(TextDrawer(font=font, text=['JAKE'], line_height=16, **values))
+        elif index % 5 >= 2:
+            # The consecutive tiles are drawn in batches.
+            drawers.append(RectangleDrawer(
+                background_image=left_image,
+                alpha=random.choice([None, 120]),
+                **values,
+            ))
+        else:
+            drawers.append(RectangleDrawer(
+                background_color=(random.randrange(256), random.randrange(256), random.randrange(256)),
+                alpha=random.choice([None, 0, 1, 90, 254, 255]),
+                brightness=random.choice([None, 0.5]),
+                **values,
+            ))
+
+    return drawers
+
+
+def _draw(drawers):
+    image = Image.new('RGB', CANVAS_SIZE, (20, 120, 220))
+    return Layer().draw(image, drawers)
+
+
+def test_numpy_backend(numpy_backend, monkeypatch):
+    drawers = _create_drawers(Random(0), 200)
+    batches = []
+    draw_batch = compositing._draw_batch
+    monkeypatch.setattr(
+        compositing,
+        '_draw_batch',
+        lambda image, drawers: batches.append(len(drawers)) or draw_batch(image, drawers),
+    )
+
+    image = _draw(drawers)
+    assert max(batches) >= 2
+
+    configure()
+    expected = _draw(drawers)
+
+    assert image.tobytes() == expected.tobytes()
+
+
+def test_numpy_backend_pattern(numpy_backend):
+    pattern = ComplexPattern(
+        context=ComplexContext(
+            left_image=join(ASSETS_PATH, 'Finn-the-human.jpg'),
+            right_image=join(ASSETS_PATH, 'Jake-the-dog.jpg'),
+            title='FINN THE HUMAN',
+            text='Adventure time',
+            layer_exists=True,
+        ),
+    )
+    image = pattern.render()
+    configure()
+
+    assert image.tobytes() == pattern.render().tobytes()
+
+
+def test_configure_without_numpy(monkeypatch):
+    monkeypatch.setattr(compositing, 'numpy', None)
+
+    with raises(ImportError):
+        configure(CompositingBackend.NUMPY)
+
+    assert compositing.get_backend() == CompositingBackend.PILLOW
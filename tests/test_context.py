@@ -0,0 +1,48 @@
+from __future__ import annotations
+from pickle import (
+    dumps,
+    loads,
+)
+from image_pattern import (
+    Canvas,
+    Context,
+    Point,
+    Rectangle,
+)
+
+
+class SizeContext(Context):
+    size: tuple
+    alpha: int
+
+
+def test_binding():
+    context = SizeContext(size=(100, 50), alpha=128)
+    rectangle = Rectangle(
+        size=(10, 10),
+        point=Point(x=1, y=2),
+        alpha=SizeContext.var('alpha'),
+    )
+    binding = rectangle.get_binding()
+
+    assert [field for field, _ in binding.dynamic_fields] == ['alpha']
+    assert 'alpha' not in binding.static_values
+    assert rectangle.collect_data(context)['alpha'] == 128
+    assert rectangle.collect_data(context)['point'] is rectangle.point
+    assert not rectangle.is_static()
+    assert rectangle.get_binding() is binding
+
+    rectangle.alpha = 64
+
+    assert rectangle.is_static()
+    assert rectangle.collect_data(context)['alpha'] == 64
+    assert rectangle.copy(update={'alpha': 32}).collect_data(context)['alpha'] == 32
+    assert loads(dumps(rectangle)).collect_data(context)['alpha'] == 64
+
+
+def test_canvas_binding():
+    canvas = Canvas(size=SizeContext.var('size'))
+
+    assert not canvas.is_static()
+    assert canvas.get_size(SizeContext(size=(100, 50), alpha=0)) == (100, 50)
+    assert Canvas(size=(10, 20)).get_size() == (10, 20)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from os.path import join
+from image_pattern.fonts import fonts
+from image_pattern.hooks import (
+    Histogram,
+    MetricsAggregator,
+    add_hook,
+    remove_hook,
+    timed,
+)
+from image_pattern.images import tiles
+
+from .patterns import (
+    ComplexPattern,
+    ComplexContext,
+    SimpleTestPattern,
+)
+from .settings import ASSETS_PATH
+
+
+def test_hooks():
+    events = []
+    aggregator = MetricsAggregator()
+    tiles.clear()
+    fonts.clear()
+    add_hook(events.append)
+    add_hook(aggregator)
+
+    try:
+        ComplexPattern(
+            context=ComplexContext(
+                left_image=join(ASSETS_PATH, 'Finn-the-human.jpg'),
+                right_image=join(ASSETS_PATH, 'Jake-the-dog.jpg'),
+                title='FINN THE HUMAN',
+                layer_exists=True,
+            ),
+        ).render_to_blob()
+    finally:
+        remove_hook(events.append)
+        remove_hook(aggregator)
+
+    stages = {event.stage for event in events}
+    metrics = aggregator.get_metrics()
+    pattern_metrics = metrics['stages']['tests.patterns.ComplexPattern']
+
+    assert {'render_to_blob', 'render', 'layer', 'layer.layout', 'element', 'font', 'decode', 'encode'} <= stages
+    assert all(event.pattern is ComplexPattern for event in events)
+    assert events[-1].stage == 'render_to_blob'
+    assert pattern_metrics['render']['count'] == 1
+    assert pattern_metrics['decode']['count'] == 2
+    assert pattern_metrics['element']['count'] == sum(
+        1 for event in events if event.stage == 'element'
+    )
+    assert metrics['caches']['tiles']['misses'] == 2
+    assert 0 <= metrics['caches']['fonts']['hit_ratio'] <= 1
+
+
+def test_hooks_entry_points():
+    events = []
+    add_hook(events.append)
+
+    try:
+        SimpleTestPattern().render_into(bytearray(1024 * 1024), format='png')
+        list(SimpleTestPattern.render_many([None], format='webp'))
+        list(SimpleTestPattern.render_many([None], blob=False))
+    finally:
+        remove_hook(events.append)
+
+    assert [event.stage for event in events if event.stage.startswith('render_')] == [
+        'render_into',
+        'render_many',
+        'render_many',
+    ]
+    assert [event.labels['format'] for event in events if event.stage == 'encode'] == ['PNG', 'WEBP']
+
+
+def test_timed_without_hooks():
+    assert timed('render') is timed('layer', index=1)
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {
+        'count': 4,
+        'sum': 2.65,
+        'buckets': [(0.1, 2), (1.0, 3), (float('inf'), 4)],
+    }
@@ -0,0 +1,71 @@
+from __future__ import annotations
+from random import Random
+from image_pattern.elements import Point
+from image_pattern.elements.base import Drawer
+from image_pattern.layers import arrange_drawers
+from image_pattern.spatial import BoxIndex
+
+
+def _create_drawers(random, count):
+    drawers = []
+
+    for _ in range(count):
+        x, y = random.randrange(0, 400), random.randrange(0, 400)
+        drawers.append(Drawer(
+            size=(random.randrange(0, 60), random.randrange(0, 60)),
+            point=Point(x=x, y=y),
+            start_point=Point(x=x, y=y),
+        ))
+
+    return drawers
+
+
+def _arrange_drawers_naive(drawers):
+    drawers = sorted(drawers, key=lambda drawer: drawer.start_point.x + drawer.start_point.y)
+    filled_areas = []
+
+    for drawer in drawers:
+        x, y = drawer.start_point.x, drawer.start_point.y
+
+        for left, top, width, height in filled_areas:
+            if left + width > x >= left and top + height > y >= top:
+                height_offset = top + height - drawer.start_point.y
+                drawer.start_point.y += height_offset
+                drawer.point.y += height_offset
+
+        filled_areas.append((drawer.start_point.x, drawer.start_point.y, *drawer.size))
+
+    return drawers
+
+
+def _get_values(drawer):
+    return drawer.size, drawer.point.to_tuple(), drawer.start_point.to_tuple()
+
+
+def test_arrange_drawers():
+    random = Random(0)
+
+    for count in [0, 1, 10, 200]:
+        drawers = _create_drawers(random, count)
+        expected = _arrange_drawers_naive([
+            Drawer(size=drawer.size, point=drawer.point, start_point=drawer.start_point)
+            for drawer in drawers
+        ])
+
+        assert [_get_values(drawer) for drawer in arrange_drawers(drawers)] == [
+            _get_values(drawer) for drawer in expected
+        ]
+
+
+def test_box_index_large_boxes():
+    index = BoxIndex(cell_size=1)
+    index.add(0, 0, 100, 100)
+    index.add(10, 10, 5, 5)
+    index.add(0, 0, 1000, 1000)
+
+    assert index.find_last(12, 12) == (0, 0, 1000, 1000)
+    assert index.find_last(2000, 2000) is None
+
+    index.add(10, 10, 5, 5)
+
+    assert index.find_last(12, 12) == (10, 10, 15, 15)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+from os.path import join
+from PIL import (
+    Image,
+    ImageChops,
+)
+from pytest import raises
+from image_pattern import Layout
+from image_pattern.context import Binding
+
+from .patterns import (
+    ComplexPattern,
+    ComplexContext,
+)
+from .settings import ASSETS_PATH
+
+
+def _create_complex_pattern(title='FINN THE HUMAN'):
+    return ComplexPattern(
+        context=ComplexContext(
+            left_image=join(ASSETS_PATH, 'Finn-the-human.jpg'),
+            right_image=join(ASSETS_PATH, 'Jake-the-dog.jpg'),
+            title=title,
+            text='Adventure time',
+            layer_exists=True,
+        ),
+    )
+
+
+def test_layout(monkeypatch):
+    pattern = _create_complex_pattern(title='FINN THE HUMAN AND JAKE THE DOG GO ON AN ADVENTURE')
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Layout must not allocate or decode images.')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Image, 'new', fail)
+        patch.setattr(Image, 'open', fail)
+        layout = pattern.layout()
+
+    elements = layout.get_elements()
+    title = next(element for element in elements if element.values.get('text') == pattern.context.title)
+
+    assert layout.size == (1200, 630)
+    assert [element.type for element in elements][:3] == ['Rectangle', 'Rectangle', 'Rectangle']
+    assert len(title.lines) > 1
+    assert title.get_box()[2] <= 1200 - 516
+    assert Layout.parse_raw(layout.json()).get_elements()[1].values['background_image'] == \
+        str(pattern.context.left_image)
+
+
+def test_render_layout():
+    pattern = _create_complex_pattern()
+    layout = pattern.layout()
+
+    assert not ImageChops.difference(pattern.render(layout=layout), pattern.render()).getbbox()
+
+    with raises(ValueError):
+        pattern.render(layout=Layout.parse_raw(layout.json()))
+
+
+def test_layout_collects_data_once(monkeypatch):
+    pattern = _create_complex_pattern()
+    bind = Binding.bind
+    calls = []
+
+    def count_bind(binding, context):
+        calls.append(binding)
+        return bind(binding, context)
+
+    monkeypatch.setattr(Binding, 'bind', count_bind)
+    layout = pattern.layout()
+
+    # The canvas and every element of the existing layers.
+    assert len(calls) == 1 + len(layout.get_elements())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from typing import List
+from PIL import Image
+from pytest import (
+    fixture,
+    raises,
+)
+from image_pattern import (
+    Canvas,
+    Layer,
+    Pattern,
+    Point,
+    Rectangle,
+)
+from image_pattern.hooks import (
+    MetricsAggregator,
+    add_hook,
+    remove_hook,
+)
+from image_pattern.images import tiles
+from image_pattern.patterns import static_bases
+from image_pattern.memory import (
+    BudgetPolicy,
+    MemoryBudgetExceeded,
+    configure,
+    track_memory,
+)
+
+from .patterns import (
+    BackgroundPattern,
+    BackgroundContext,
+)
+
+
+@fixture()
+def background_pattern(tmp_path):
+    path = tmp_path / 'background.jpg'
+    Image.linear_gradient('L').resize((900, 900)).convert('RGB').save(path)
+    return BackgroundPattern(context=BackgroundContext(background_image=path))
+
+
+@fixture()
+def aggregator():
+    aggregator = MetricsAggregator()
+    add_hook(aggregator)
+    tiles.clear()
+    static_bases.clear()
+    yield aggregator
+    remove_hook(aggregator)
+    configure(budget=None)
+
+
+def _get_peak_memory(aggregator):
+    return aggregator.get_metrics()['peak_memory']['tests.patterns.BackgroundPattern']
+
+
+def test_peak_memory(background_pattern, aggregator):
+    background_pattern.render()
+
+    # The cached base of the canvas and its copy, the decoded background and its resized copy.
+    # The pixels of RGB images are stored in 4 bytes.
+    assert _get_peak_memory(aggregator) == 4 * (500 * 500 * 3 + 900 * 900)
+
+
+def test_track_memory(background_pattern, aggregator):
+    with track_memory() as account:
+        background_pattern.render()
+
+    assert account.peak == _get_peak_memory(aggregator)
+
+
+def test_memory_budget(background_pattern, aggregator):
+    budget = 4 * 1000 * 1000
+    configure(budget=budget)
+
+    with raises(MemoryBudgetExceeded):
+        background_pattern.render()
+
+    configure(budget=budget, policy=BudgetPolicy.DOWNSCALE)
+    image = background_pattern.render()
+
+    assert image.size == (500, 500)
+    assert _get_peak_memory(aggregator) <= budget
+
+
+def test_downscaled_tile_not_shared(background_pattern, aggregator):
+    expected = background_pattern.render()
+    tiles.clear()
+    configure(budget=4 * 1000 * 1000, policy=BudgetPolicy.DOWNSCALE)
+    background_pattern.render()
+    configure(budget=None)
+
+    assert background_pattern.render().tobytes() == expected.tobytes()
+
+
+def test_downscaled_static_base_not_shared(background_pattern, aggregator):
+    class StaticBackgroundPattern(Pattern):
+        canvas: Canvas = Canvas(size=(500, 500))
+        layers: List[Layer] = [
+            Layer(
+                Rectangle(
+                    background_image=background_pattern.context.background_image,
+                    size=(500, 500),
+                    point=Point(x=0, y=0),
+                ),
+            ),
+        ]
+
+    expected = StaticBackgroundPattern().render()
+    static_bases.clear()
+    tiles.clear()
+    configure(budget=4 * 1000 * 1000, policy=BudgetPolicy.DOWNSCALE)
+    StaticBackgroundPattern().render()
+    configure(budget=None)
+
+    assert StaticBackgroundPattern().render().tobytes() == expected.tobytes()
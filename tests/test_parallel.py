@@ -0,0 +1,54 @@
+from __future__ import annotations
+from image_pattern.fonts import fonts
+from image_pattern.parallel import (
+    _get_static_base,
+    _initialize_worker,
+    _worker,
+    render_parallel,
+)
+from image_pattern.patterns import static_bases
+
+from .patterns import (
+    SimpleTestPattern,
+    SmallTestPattern,
+    SmallTestPatternContext,
+)
+
+
+def _create_contexts(count):
+    return [
+        SmallTestPatternContext(
+            text=str(index),
+            background_color=(3, 202, 252),
+            horizontal_alignment='CENTER',
+            vertical_alignment='CENTER',
+        )
+        for index in range(count)
+    ]
+
+
+def test_render_parallel():
+    contexts = _create_contexts(7)
+    results = list(render_parallel(SmallTestPattern, iter(contexts), workers=2, chunk_size=2, quality=95))
+
+    assert [context for context, _ in results] == contexts
+
+    for context, blob in results:
+        assert blob.getvalue() == SmallTestPattern(context=context).render_to_blob(quality=95).getvalue()
+
+
+def test_render_parallel_unordered():
+    contexts = _create_contexts(5)
+    results = list(render_parallel(SmallTestPattern, contexts, workers=2, chunk_size=1, ordered=False))
+
+    assert sorted(context.text for context, _ in results) == [context.text for context in contexts]
+
+
+def test_initialize_worker():
+    static_base = _get_static_base(SimpleTestPattern)
+    static_bases.clear()
+    fonts.clear()
+    _initialize_worker(SimpleTestPattern, static_base, {})
+
+    assert static_bases.get(_worker['pattern']._get_base_key()) is static_base
+    assert fonts.info().length == 1
@@ -0,0 +1,83 @@
+from __future__ import annotations
+from itertools import product
+from PIL import Image
+from pytest import mark
+from image_pattern.elements import Point
+from image_pattern.elements.rectangle import RectangleDrawer
+from image_pattern.memory import track_memory
+
+
+def _create_canvas():
+    image = Image.new('RGB', (200, 150))
+    image.putdata([(x, y, (x * y) % 256) for y in range(150) for x in range(200)])
+    return image
+
+
+def _paste_overlay(image, drawer):
+    overlay_image = drawer.get_image()
+    image.paste(overlay_image, drawer.start_point.to_tuple(), mask=overlay_image)
+    return image
+
+
+@mark.parametrize('background_color, alpha, brightness', [
+    ((3, 202, 252), None, None),
+    ((3, 202, 252), 255, 0.8),
+    ((3, 202, 252), 0, None),
+    ((3, 202, 252), 1, None),
+    ((3, 202, 252), 127, None),
+    ((3, 202, 252), 200, 0.4),
+    ((3, 202, 252, 90), None, None),
+    ((3, 202, 252, 90), 180, 1.5),
+    ((250, 10, 128), None, 1.7),
+])
+@mark.parametrize('point, size', [
+    ((20, 30), (100, 50)),
+    ((-40, -10), (120, 80)),
+    ((150, 100), (100, 100)),
+    ((0, 0), (200, 150)),
+    ((10, 10), (0, 20)),
+])
+def test_fill(background_color, alpha, brightness, point, size):
+    x, y = point
+    drawer = RectangleDrawer(
+        size=size,
+        point=Point(x=x, y=y),
+        start_point=Point(x=x, y=y),
+        background_color=background_color,
+        alpha=alpha,
+        brightness=brightness,
+    )
+
+    expected = _paste_overlay(_create_canvas(), drawer)
+
+    with track_memory() as account:
+        image = drawer.draw(_create_canvas())
+
+    assert image.tobytes() == expected.tobytes()
+    # The color is computed without images.
+    assert account.peak == 0
+
+
+@mark.parametrize('background_color', [
+    (0, 0, 0),
+    (255, 255, 255),
+    (3, 202, 252),
+    (250, 10, 128),
+    (3, 202, 252, 90),
+    (17, 99, 201, 0),
+])
+def test_color(background_color):
+    for brightness, alpha in product(
+            [None, -0.5, 0, 0.1, 0.3, 0.4, 0.5, 0.77, 0.8, 0.999, 1, 1.5, 1.7, 2.3],
+            [None, 0, 1, 90, 127, 128, 254, 255],
+    ):
+        drawer = RectangleDrawer(
+            size=(10, 10),
+            point=Point(x=0, y=0),
+            start_point=Point(x=0, y=0),
+            background_color=background_color,
+            alpha=alpha,
+            brightness=brightness,
+        )
+
+        assert drawer.get_color() == drawer._create_image((1, 1)).getpixel((0, 0))
@@ -0,0 +1,209 @@
+from __future__ import annotations
+from typing import List
+from io import (
+    SEEK_CUR,
+    UnsupportedOperation,
+)
+from os.path import join
+from pytest import raises
+from PIL import Image
+from image_pattern import (
+    Canvas,
+    ImageFormat,
+    Layer,
+    Pattern,
+    Point,
+    Rectangle,
+)
+from image_pattern.patterns import (
+    static_bases,
+    get_image_blob,
+)
+
+from image_pattern.sinks import SinkWriter
+
+from .patterns import (
+    ComplexPattern,
+    ComplexContext,
+    SimpleTestPattern,
+    SmallTestPattern,
+    SmallTestPatternContext,
+)
+from .settings import ASSETS_PATH
+
+
+def _create_complex_context(**kwargs):
+    return ComplexContext(**{
+        'left_image': join(ASSETS_PATH, 'Finn-the-human.jpg'),
+        'right_image': join(ASSETS_PATH, 'Jake-the-dog.jpg'),
+        'title': 'FINN THE HUMAN',
+        'layer_exists': True,
+        **kwargs,
+    })
+
+
+def test_static_layers():
+    static_bases.clear()
+    context = _create_complex_context()
+    pattern = ComplexPattern(context=context)
+    image = pattern.render()
+
+    assert pattern.render().tobytes() == image.tobytes()
+    assert static_bases.info().misses == 1
+    assert static_bases.info().hits == 1
+    assert static_bases.get(pattern._get_base_key())[1] == 1
+
+    not_cached_pattern = Pattern(context=context, canvas=pattern.canvas, layers=pattern.layers)
+
+    assert not_cached_pattern.render().tobytes() == image.tobytes()
+    assert static_bases.info().hits == 2
+
+
+def test_static_pattern():
+    static_bases.clear()
+    pattern = SimpleTestPattern()
+    image = pattern.render()
+    base_image, static_layers_count = static_bases.get(pattern._get_base_key())
+
+    assert static_layers_count == 2
+    assert base_image.tobytes() == image.tobytes()
+    assert base_image is not image
+
+
+def test_static_background_changed(tmp_path):
+    path = tmp_path / 'background.png'
+    Image.new('RGB', (10, 10), (255, 0, 0)).save(path)
+
+    class BackgroundPattern(Pattern):
+        canvas: Canvas = Canvas(size=(20, 20))
+        layers: List[Layer] = [
+            Layer(
+                Rectangle(
+                    background_image=path,
+                    size=(20, 20),
+                    point=Point(x=0, y=0),
+                ),
+            ),
+        ]
+
+    assert BackgroundPattern().render().getpixel((10, 10)) == (255, 0, 0)
+
+    Image.new('RGB', (20, 20), (0, 0, 255)).save(path)
+
+    assert BackgroundPattern().render().getpixel((10, 10)) == (0, 0, 255)
+
+
+def test_render_many():
+    contexts = [
+        _create_complex_context(title='FINN THE HUMAN'),
+        _create_complex_context(title='JAKE THE DOG'),
+        _create_complex_context(title='FINN THE HUMAN'),
+    ]
+    results = list(ComplexPattern.render_many(iter(contexts), quality=95))
+
+    assert [context for context, _ in results] == contexts
+    assert results[0][1].getvalue() == results[2][1].getvalue()
+    assert results[0][1] is not results[2][1]
+    assert results[0][1].getvalue() != results[1][1].getvalue()
+    assert results[1][1].getvalue() == ComplexPattern(context=contexts[1]).render_to_blob(quality=95).getvalue()
+
+
+def test_render_many_images():
+    contexts = [
+        _create_complex_context(),
+        _create_complex_context(),
+    ]
+    (_, first_image), (_, second_image) = ComplexPattern.render_many(contexts, blob=False)
+
+    assert first_image is not second_image
+    assert first_image.tobytes() == second_image.tobytes()
+    assert first_image.tobytes() == ComplexPattern(context=contexts[0]).render().tobytes()
+
+
+def test_render_to_blob_formats():
+    pattern = SimpleTestPattern()
+    image = pattern.render()
+
+    for image_format in [ImageFormat.PNG, ImageFormat.WEBP, 'png']:
+        blob = pattern.render_to_blob(format=image_format)
+        result_image = Image.open(blob)
+
+        assert result_image.format == ImageFormat(image_format.upper()).value
+        assert result_image.size == image.size
+
+    png_image = Image.open(pattern.render_to_blob(format=ImageFormat.PNG, compress_level=1))
+
+    assert png_image.convert('RGB').tobytes() == image.tobytes()
+
+
+def test_palette_encoding():
+    image = Image.new('RGB', (100, 100), (51, 204, 255))
+    image.paste((255, 51, 153), (50, 0, 100, 100))
+    blob = get_image_blob(image, format=ImageFormat.PNG)
+    result_image = Image.open(blob)
+
+    assert result_image.mode == 'P'
+    assert result_image.convert('RGB').tobytes() == image.tobytes()
+
+
+def test_palette_encoding_antialiased_text():
+    pattern = SmallTestPattern(
+        context=SmallTestPatternContext(
+            text='Jake',
+            background_color=(3, 202, 252),
+            horizontal_alignment='CENTER',
+            vertical_alignment='CENTER',
+        ),
+    )
+    image = pattern.render()
+    result_image = Image.open(pattern.render_to_blob(format=ImageFormat.PNG))
+
+    assert result_image.convert('RGB').tobytes() == image.tobytes()
+
+
+def test_unsupported_format(monkeypatch):
+    Image.init()
+    monkeypatch.delitem(Image.SAVE, 'WEBP')
+
+    with raises(ValueError):
+        get_image_blob(Image.new('RGB', (1, 1)), format=ImageFormat.WEBP)
+
+
+def test_render_into(tmp_path):
+    pattern = SimpleTestPattern()
+    blob = pattern.render_to_blob(format=ImageFormat.PNG)
+    size = len(blob.getvalue())
+
+    buffer = bytearray(size + 10)
+    assert pattern.render_into(buffer, format=ImageFormat.PNG) == size
+    assert buffer[:size] == blob.getvalue()
+
+    with raises(ValueError):
+        pattern.render_into(memoryview(bytearray(size - 1)), format=ImageFormat.PNG)
+
+    path = tmp_path / 'image.png'
+
+    with open(path, 'wb') as file:
+        assert pattern.render_into(file, format=ImageFormat.PNG) == size
+
+    assert path.read_bytes() == blob.getvalue()
+
+    with open(path, 'wb') as file:
+        assert pattern.render_into(file.fileno(), format=ImageFormat.PNG) == size
+
+    assert path.read_bytes() == blob.getvalue()
+
+    with raises(TypeError):
+        pattern.render_into(str(path))
+
+
+def test_sink_writer_position():
+    writer = SinkWriter(bytearray(10))
+    writer.write(b'abc')
+
+    assert writer.tell() == 3
+    assert writer.seek(3) == 3
+    assert writer.seek(0, SEEK_CUR) == 3
+
+    with raises(UnsupportedOperation):
+        writer.seek(0)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from os import utime
+from os.path import join
+from shutil import copyfile
+from pytest import raises
+from image_pattern import ImageFormat
+from image_pattern.hashing import get_digest
+from image_pattern.render_cache import RenderCache
+
+from .patterns import (
+    ComplexPattern,
+    ComplexContext,
+    SimpleTestPattern,
+)
+from .settings import ASSETS_PATH
+
+THRESHOLD = 1
+
+
+def _create_complex_pattern(left_image=join(ASSETS_PATH, 'Finn-the-human.jpg'), title='FINN THE HUMAN'):
+    return ComplexPattern(
+        context=ComplexContext(
+            left_image=left_image,
+            right_image=join(ASSETS_PATH, 'Jake-the-dog.jpg'),
+            title=title,
+            layer_exists=True,
+        ),
+    )
+
+
+def test_render_cache(tmp_path):
+    cache = RenderCache(tmp_path)
+    pattern = _create_complex_pattern()
+    blob = pattern.render_to_blob(cache=cache, quality=95)
+    key = cache.get_key(pattern, quality=95)
+
+    assert cache.get(key) == blob.getvalue()
+    assert pattern.render_to_blob(cache=cache, quality=95).getvalue() == blob.getvalue()
+    assert cache.get_size() == len(blob.getvalue())
+
+    assert cache.get_key(_create_complex_pattern(), quality=95) == key
+    assert cache.get_key(pattern, quality=90) != key
+    assert cache.get_key(pattern, format=ImageFormat.PNG, quality=95) != key
+    assert cache.get_key(_create_complex_pattern(title='JAKE THE DOG'), quality=95) != key
+
+
+def test_render_cache_file_content(tmp_path):
+    cache = RenderCache(tmp_path / 'cache')
+    image_path = str(tmp_path / 'image.jpg')
+    copyfile(join(ASSETS_PATH, 'Finn-the-human.jpg'), image_path)
+    key = cache.get_key(_create_complex_pattern(left_image=image_path))
+
+    copyfile(join(ASSETS_PATH, 'Jake-the-dog.jpg'), image_path)
+
+    assert cache.get_key(_create_complex_pattern(left_image=image_path)) != key
+
+
+def test_render_cache_eviction(tmp_path):
+    cache = RenderCache(tmp_path)
+    cache.set('a' * 64, b'a' * 100)
+    cache.set('b' * 64, b'b' * 100)
+    utime(cache._get_path('a' * 64), (1, 1))
+    utime(cache._get_path('b' * 64), (0, 0))
+    cache.max_size = 250
+    cache.set('c' * 64, b'c' * 100)
+
+    assert cache.get('b' * 64) is None
+    assert cache.get('a' * 64) == b'a' * 100
+    assert cache.get('c' * 64) == b'c' * 100
+    assert cache.get_size() == 200
+
+    cache.clear()
+
+    assert cache.get_size() == 0
+
+
+def test_render_cache_not_hashable_context(tmp_path):
+    cache = RenderCache(tmp_path)
+    pattern = SimpleTestPattern()
+    pattern.context = object()
+
+    assert cache.get_key(pattern) is None
+    assert pattern.render_to_blob(cache=cache).getvalue()
+    assert cache.get_size() == 0
+
+
+def _create_scale(factor):
+    def scale(value):
+        return value * factor
+
+    return scale
+
+
+def _create_offset(default):
+    def offset(value, shift=default):
+        return value + shift
+
+    return offset
+
+
+def test_function_digest():
+    assert get_digest(_create_scale(2)) == get_digest(_create_scale(2))
+    assert get_digest(_create_scale(2)) != get_digest(_create_scale(3))
+    assert get_digest(_create_offset(1)) != get_digest(_create_offset(2))
+
+    with raises(TypeError):
+        get_digest(_create_scale(object()))
+
+
+def _create_sign_check(positive):
+    if positive:
+        return lambda values: all(value > 0 for value in values)
+
+    return lambda values: all(value < 0 for value in values)
+
+
+def _is_above_threshold(value):
+    return value > THRESHOLD
+
+
+def _countdown(value):
+    return _countdown(value - 1) if value else 0
+
+
+def test_function_digest_nested_code():
+    assert get_digest(_create_sign_check(True)) == get_digest(_create_sign_check(True))
+    assert get_digest(_create_sign_check(True)) != get_digest(_create_sign_check(False))
+
+
+def test_function_digest_globals(monkeypatch):
+    digest = get_digest(_is_above_threshold)
+    monkeypatch.setitem(globals(), 'THRESHOLD', 2)
+
+    assert get_digest(_is_above_threshold) != digest
+    assert get_digest(_countdown) == get_digest(_countdown)
+
+    monkeypatch.setitem(globals(), 'THRESHOLD', object())
+
+    with raises(TypeError):
+        get_digest(_is_above_threshold)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from io import BytesIO
+from os.path import join
+from PIL import (
+    Image,
+    ImageChops,
+)
+from image_pattern.size import (
+    open_image,
+    resize_image,
+    scale_image,
+    crop_image,
+)
+
+from .settings import ASSETS_PATH
+
+
+def _create_jpeg(size):
+    blob = BytesIO()
+    Image.new('RGB', size, (3, 202, 252)).save(blob, 'JPEG')
+    blob.seek(0)
+    return blob
+
+
+def test_open_image_draft():
+    image = open_image(_create_jpeg((4000, 3000)), (458, 630))
+    image.load()
+
+    assert image.size == (1000, 750)
+
+
+def test_open_image_without_draft():
+    assert open_image(_create_jpeg((1024, 768)), (458, 630)).size == (1024, 768)
+    assert open_image(_create_jpeg((400, 300)), (1200, 720)).size == (400, 300)
+
+
+def test_resize_image_size():
+    image = Image.new('RGB', (1024, 768))
+
+    assert resize_image(image, (458, 630)).size == (458, 630)
+    assert resize_image(image, (457, 631)).size == (457, 631)
+    assert resize_image(image, (1201, 719)).size == (1201, 719)
+    assert resize_image(image, (100, 100), reducing_gap=2.0).size == (100, 100)
+
+
+def test_resize_image_as_scale_and_crop():
+    image = Image.open(join(ASSETS_PATH, 'Jake-the-dog.jpg'))
+    size = (458, 630)
+    scaled_image, center = scale_image(image, size)
+    expected_image = crop_image(scaled_image, size, center)
+
+    difference = ImageChops.difference(resize_image(image, size), expected_image)
+
+    assert max(band_max for _, band_max in difference.getextrema()) <= 2